@@ -1,4 +1,3 @@
-from cq_cam.fluent import Job
 from cq_cam.groups import Unit
 
 METRIC = Unit.METRIC
@@ -9,3 +8,12 @@ __all__ = [
     "METRIC",
     "IMPERIAL",
 ]
+
+
+def __getattr__(name):
+    # Job pulls in cadquery and OCCT, import it only once it's asked for
+    if name == "Job":
+        from cq_cam.fluent import Job
+
+        return Job
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,7 @@
 """
 # G-code Letter and Word Address Syntax
 
-G-code (also RS-274/NGC) is the most widely-used computer numerical control (CNC) programming language. 
+G-code (also RS-274/NGC) is the most widely-used computer numerical control (CNC) programming language.
 It is used mainly in computer-aided manufacturing to control automated machine tools, as well as from a 3D-printing slicer app.
 Here we concentrate on a subset of G-code relevant for 3-axis CNC machining. Explanations of commands that are out of scope will be included for completeness and it will be indicated that they are out of scope.
 
@@ -43,27 +43,22 @@ Below is a comprehensive list of the available letter addresses:
 inch: 4 fractional positions
 mm: 3 fractional positions
 """
+
+import math
 from abc import ABC
 from enum import Enum
+from functools import lru_cache
+from typing import Iterable, NamedTuple
 
 import cadquery as cq
+import numpy as np
+from OCP.gp import gp_Pnt
 
-from cq_cam.utils.utils import optimize_float
-
-
-class AddressVector:
-    __slots__ = ("x", "y", "z")
 
-    def __init__(self, x=None, y=None, z=None):
-        self.x = x
-        self.y = y
-        self.z = z
-
-    def __eq__(self, other) -> bool:
-        try:
-            return self.x == other.x and self.y == other.y and self.z == other.z
-        except AttributeError:
-            return NotImplemented
+class AddressVector(NamedTuple):
+    x: float | None = None
+    y: float | None = None
+    z: float | None = None
 
     def __str__(self) -> str:
         return f"({self.x} {self.y} {self.z})"
@@ -73,19 +68,75 @@ class AddressVector:
         return cls(v.x, v.y, v.z)
 
     def to_vector(self, origin: cq.Vector, relative=False):
+        return cq.Vector(*self.to_floats(origin, relative))
+
+    def to_floats(self, origin, relative=False) -> tuple[float, float, float]:
+        """
+        `to_vector` without building the `cq.Vector`, for when only the
+        coordinates are needed
+
+        :param origin: anything with x, y and z, such as another address
+        """
+        x, y, z = self
         if relative:
-            x = 0 if self.x is None else self.x - origin.x
-            y = 0 if self.y is None else self.y - origin.y
-            z = 0 if self.z is None else self.z - origin.z
-        else:
-            x = origin.x if self.x is None else self.x
-            y = origin.y if self.y is None else self.y
-            z = origin.z if self.z is None else self.z
-        return cq.Vector(x, y, z)
+            return (
+                0 if x is None else x - origin.x,
+                0 if y is None else y - origin.y,
+                0 if z is None else z - origin.z,
+            )
+        if x is None or y is None or z is None:
+            return (
+                origin.x if x is None else x,
+                origin.y if y is None else y,
+                origin.z if z is None else z,
+            )
+        return x, y, z
+
+    def filled(self, origin: "AddressVector") -> "AddressVector":
+        """
+        :return: address with the missing addresses taken from `origin`,
+                 or the address itself when none are missing
+        """
+        x, y, z = self
+        if x is not None and y is not None and z is not None:
+            return self
+        # Skip the keyword handling of the generated constructor
+        return tuple.__new__(
+            AddressVector,
+            (
+                origin.x if x is None else x,
+                origin.y if y is None else y,
+                origin.z if z is None else z,
+            ),
+        )
+
+    def to_pnt(self) -> gp_Pnt:
+        """
+        OCCT point of a complete address. Consecutive commands share their
+        end and start addresses, so recent points are reused.
+        """
+        return _address_pnt(self)
+
+    @staticmethod
+    def to_array(addresses: Iterable["AddressVector"]) -> np.ndarray:
+        """
+        :return: array of shape (N, 3) where missing addresses are NaN
+        """
+        return np.array(list(addresses), dtype=float).reshape(-1, 3)
+
+
+@lru_cache(maxsize=256)
+def _address_pnt(address: AddressVector) -> gp_Pnt:
+    return gp_Pnt(*address)
 
 
 #############################################################################
-class GCodeLetter(Enum):
+class GCodeLetter(str, Enum):
+    """
+    The letters are plain strings as well, so words can be concatenated
+    without going through the Enum formatting.
+    """
+
     XAxis = "X"
     YAxis = "Y"
     ZAxis = "Z"
@@ -106,6 +157,43 @@ class GCodeLetter(Enum):
         return self._value_
 
 
+def format_address(address: float, precision: int = 3) -> str:
+    """
+    Same as `str(optimize_float(round(address, precision)))`. Formatting
+    with a fixed precision rounds exactly like `round` does, after which
+    the trailing zeroes are dropped.
+    """
+    word = f"{address:.{precision}f}"
+    if precision > 0:
+        word = word.rstrip("0").rstrip(".")
+    return "0" if word == "-0" else word
+
+
+def suppress_unchanged(
+    points: np.ndarray, precision: int = 3, restarts: Iterable[bool] | None = None
+) -> np.ndarray:
+    """
+    Blank out addresses that don't change from the previous point once
+    rounded to `precision`. The result can be passed to `format_batch` to
+    leave out the redundant words of modal motion. A point that would lose
+    every address is kept as is, since a motion line must have an axis word.
+
+    :param points: array of shape (N, 3), missing addresses are NaN
+    :param restarts: optional flag per point, a point that follows something
+        other than motion keeps all its addresses
+    :return: array of shape (N, 3)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    rounded = np.round(points, precision)
+    unchanged = np.zeros(points.shape, dtype=bool)
+    unchanged[1:] = rounded[1:] == rounded[:-1]
+    if restarts is not None:
+        unchanged[np.fromiter(restarts, dtype=bool, count=len(points))] = False
+    # Missing addresses don't count as words the point keeps
+    unchanged[(unchanged | np.isnan(points)).all(axis=1)] = False
+    return np.where(unchanged, np.nan, points)
+
+
 #################################################################################
 class GCodeWord(ABC):
     letter: GCodeLetter
@@ -114,12 +202,17 @@ class GCodeWord(ABC):
     def __init__(self, letter: GCodeLetter, address: float | int):
         self.letter = letter
         self.address = address
+        # Words don't change after construction, so format them only once
+        self._str = self._format()
 
-    def __str__(self):
+    def _format(self) -> str:
         if self.address is not None:
-            return f"{self.letter}{self.address}"
+            return self.letter + str(self.address)
         return ""
 
+    def __str__(self):
+        return self._str
+
 
 class GCodeWordPrecision(GCodeWord, ABC):
     precision: int
@@ -128,10 +221,9 @@ class GCodeWordPrecision(GCodeWord, ABC):
         self.precision = precision
         super().__init__(letter, address)
 
-    def __str__(self):
+    def _format(self) -> str:
         if self.address is not None:
-            address_opt = optimize_float(round(self.address, self.precision))
-            return f"{self.letter}{address_opt}"
+            return self.letter + format_address(self.address, self.precision)
         return ""
 
 
@@ -197,6 +289,8 @@ class ToolRadiusOffset(GCodeWord):
 
 #################################################################################
 class GCodeAxisGroup(ABC):
+    letters: tuple[GCodeLetter, GCodeLetter, GCodeLetter]
+    _template: str
     axis_1: GCodeWord
     axis_2: GCodeWord
     axis_3: GCodeWord
@@ -207,22 +301,69 @@ class GCodeAxisGroup(ABC):
         self.axis_3 = axis_3
 
     def __str__(self):
-        coords = []
-        axis_1 = str(self.axis_1)
-        axis_2 = str(self.axis_2)
-        axis_3 = str(self.axis_3)
+        # Words of missing addresses are blank and left out
+        return " ".join(
+            filter(None, (str(self.axis_1), str(self.axis_2), str(self.axis_3)))
+        )
 
-        if axis_1 != "":
-            coords.append(axis_1)
-        if axis_2 != "":
-            coords.append(axis_2)
-        if axis_3 != "":
-            coords.append(axis_3)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Template for the usual case where every address is present
+        cls._template = " ".join(letter + "{}" for letter in cls.letters)
 
-        return " ".join(coords)
+    @classmethod
+    def format(cls, point: Iterable[float | None], precision: int = 3) -> str:
+        """
+        Same as `str(cls(point))` without creating the word objects
+        """
+        a1, a2, a3 = point
+        if a1 is not None and a2 is not None and a3 is not None:
+            return cls._template.format(
+                format_address(a1, precision),
+                format_address(a2, precision),
+                format_address(a3, precision),
+            )
+        return " ".join(
+            [
+                letter + format_address(address, precision)
+                for letter, address in zip(cls.letters, point)
+                if address is not None
+            ]
+        )
+
+    @classmethod
+    def format_batch(cls, points: np.ndarray, precision: int = 3) -> list[str]:
+        """
+        Same as `str(cls(point))` for many points at once
+
+        :param points: array of shape (N, 3), missing addresses are NaN
+        :return: list of N strings
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        columns = []
+        for letter, addresses in zip(cls.letters, points.T):
+            # Toolpaths repeat the same addresses a lot, format each only once
+            uniques, inverse = np.unique(addresses, return_inverse=True)
+            words = np.array(
+                [
+                    (
+                        ""
+                        if math.isnan(address)
+                        else letter + format_address(address, precision)
+                    )
+                    for address in uniques.tolist()
+                ],
+                dtype=object,
+            )
+            columns.append(words[inverse.reshape(-1)].tolist())
+        if not np.isnan(points).any():
+            return [f"{w1} {w2} {w3}" for w1, w2, w3 in zip(*columns)]
+        return [" ".join(filter(None, words)) for words in zip(*columns)]
 
 
 class XYZ(GCodeAxisGroup):
+    letters = (GCodeLetter.XAxis, GCodeLetter.YAxis, GCodeLetter.ZAxis)
+
     def __init__(self, end: AddressVector, precision: int = 3):
         axis_1 = XAxis(end.x, precision)
         axis_2 = YAxis(end.y, precision)
@@ -232,6 +373,8 @@ class XYZ(GCodeAxisGroup):
 
 
 class IJK(GCodeAxisGroup):
+    letters = (GCodeLetter.ArcXAxis, GCodeLetter.ArcYAxis, GCodeLetter.ArcZAxis)
+
     def __init__(self, center: AddressVector, precision: int = 3):
         axis_1 = ArcXAxis(center.x, precision)
         axis_2 = ArcYAxis(center.y, precision)
@@ -83,12 +83,15 @@ It is organised in a similiar fashion, into motion and non motion commands. Moti
 
 from __future__ import annotations
 
-import warnings
 from abc import ABC, abstractmethod
+from functools import cache
 
 import cadquery as cq
 from OCP.AIS import AIS_Line, AIS_Shape
+from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
+from OCP.GC import GC_MakeArcOfCircle
 from OCP.Geom import Geom_CartesianPoint
+from OCP.gp import gp_Vec
 
 from cq_cam.address import (
     IJK,
@@ -122,121 +125,176 @@ from cq_cam.groups import (
 )
 from cq_cam.visualize import cached_occ_color
 
+# Same tolerance as comparing `cq.Vector`s
+LINEAR_TOLERANCE = 0.00001
+ORIGIN = AddressVector(0, 0, 0)
+
 
 class Command(ABC):
-    pass
+    __slots__ = ()
+
+
+def linear_ais_shape(
+    command: MotionCommand, as_edges=False, alt_color=False
+) -> AIS_Shape | cq.Edge | None:
+    """Shared `to_ais_shape` implementation for straight line motion"""
+    start = command.start.filled(ORIGIN)
+    end = command.end.filled(start)
+
+    # The end point is usually the start point of the next command,
+    # so its OCCT point gets reused
+    start = start.to_pnt()
+    end = end.to_pnt()
+
+    if start.IsEqual(end, LINEAR_TOLERANCE):
+        return None
+
+    if as_edges:
+        return cq.Edge(BRepBuilderAPI_MakeEdge(start, end).Edge())
+
+    shape = AIS_Line(Geom_CartesianPoint(start), Geom_CartesianPoint(end))
+    if command.arrow:
+        shape.Attributes().SetLineArrowDraw(True)
+
+    shape.SetColor(command.occ_color(alt_color))
+
+    return shape
 
 
 class MotionCommand(Command, ABC):
+    __slots__ = ("start", "end", "arrow", "_gcode")
+
     modal: MotionControl
     start: AddressVector
     end: AddressVector
     ais_color = "red"
     ais_alt_color = "darkred"
+    _modal_str: str
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The modal word is the same for every command of the class
+        modal = getattr(cls, "modal", None)
+        if modal is not None:
+            cls._modal_str = str(modal)
 
     def __init__(
         self,
         end: AddressVector,
         start: AddressVector | None,
         arrow=False,
-        **kwargs,
     ):
         if start is not None:
-            if end.x is None:
-                end.x = start.x
-            if end.y is None:
-                end.y = start.y
-            if end.z is None:
-                end.z = start.z
+            end = end.filled(start)
         else:
             start = AddressVector()
         self.start = start
         self.end = end
         self.arrow = arrow
-
-        super().__init__(**kwargs)
+        self._gcode = None
 
     @classmethod
     def abs(cls, x=None, y=None, z=None, start: AddressVector | None = None, **kwargs):
-        return cls(end=AddressVector(x=x, y=y, z=z), start=start, **kwargs)
+        return cls(end=AddressVector(x, y, z), start=start, **kwargs)
 
     @abstractmethod
     def to_ais_shape(self, as_edges=False, alt_color=False) -> AIS_Shape:
         pass
 
+    @abstractmethod
+    def to_gcode(self, xyz: str | None = None) -> str:
+        """
+        :param xyz: the end point words when they have already been
+                    formatted, see `XYZ.format_batch`
+        """
+        pass
 
-class RapidCommand(MotionCommand, ABC):
-    modal = Path.RAPID
-
-    def to_ais_shape(self, as_edges=False, alt_color=False) -> AIS_Shape:
-        x = self.start.x if self.start.x is not None else 0
-        y = self.start.y if self.start.y is not None else 0
-        z = self.start.z if self.start.z is not None else 0
-
-        start = cq.Vector(x, y, z)
-        end = self.end.to_vector(start)
-
-        if start == end:
-            return None
-
-        if as_edges:
-            return cq.Edge.makeLine(start, end)
+    def __str__(self) -> str:
+        # Commands are not modified after construction
+        if self._gcode is None:
+            self._gcode = self.to_gcode()
+        return self._gcode
 
-        shape = AIS_Line(
-            Geom_CartesianPoint(start.toPnt()), Geom_CartesianPoint(end.toPnt())
-        )
-        if self.arrow:
-            shape.Attributes().SetLineArrowDraw(True)
+    @classmethod
+    def occ_color(cls, alt_color=False):
+        """OCCT colour of this command class, converted once per class"""
+        try:
+            return cls.__dict__["_occ_colors"][alt_color]
+        except KeyError:
+            cls._occ_colors = (
+                cached_occ_color(cls.ais_color),
+                cached_occ_color(cls.ais_alt_color),
+            )
+            return cls._occ_colors[alt_color]
 
-        shape.SetColor(
-            cached_occ_color(self.ais_alt_color if alt_color else self.ais_color)
-        )
 
-        return shape
+class RapidCommand(MotionCommand, ABC):
+    __slots__ = ()
 
-    def __str__(self) -> str:
-        modal = str(self.modal)
-        xyz = str(XYZ(self.end))
-        words = [modal, xyz]
+    modal = Path.RAPID
 
-        # words.append(f"({XYZ(self.start)})")
+    to_ais_shape = linear_ais_shape
 
-        return " ".join(words)
+    def to_gcode(self, xyz: str | None = None) -> str:
+        xyz = XYZ.format(self.end) if xyz is None else xyz
+        return f"{self._modal_str} {xyz}"
 
 
 class Rapid(RapidCommand):
+    __slots__ = ()
+
     ais_color = "green"
 
 
 class PlungeRapid(Rapid):
+    __slots__ = ()
+
     ais_color = "yellow"
 
-    def __init__(self, end, start, **kwargs):
+    def __init__(self, end: AddressVector, start: AddressVector | None, arrow=False):
         if end.x is not None or end.y is not None:
             raise RuntimeError("Plunge can only operate on z axis")
-        super().__init__(end, start, **kwargs)
+        MotionCommand.__init__(self, end, start, arrow)
 
     @classmethod
     def abs(cls, z=None, start: AddressVector | None = None, **kwargs):
-        return cls(end=AddressVector(z=z), start=start, **kwargs)
+        return cls(end=AddressVector(None, None, z), start=start, **kwargs)
 
 
 class Retract(Rapid):
     """Rapid retract"""
 
+    __slots__ = ()
+
     ais_color = "blue"
 
-    def __init__(self, end, start, **kwargs):
+    def __init__(self, end: AddressVector, start: AddressVector | None, arrow=False):
         if end.x is not None or end.y is not None:
             raise RuntimeError("Retract can only operate on z axis")
-        super().__init__(end, start, **kwargs)
+        MotionCommand.__init__(self, end, start, arrow)
 
     @classmethod
     def abs(cls, z=None, start: AddressVector | None = None, **kwargs):
-        return cls(end=AddressVector(z=z), start=start, **kwargs)
+        return cls(end=AddressVector(None, None, z), start=start, **kwargs)
+
+
+def feed_word(feed: float | None) -> str:
+    """
+    :return: the feed word with a leading space, blank without a feed
+    """
+    return _feed_word(type(feed), feed)
+
+
+@cache
+def _feed_word(feed_type: type, feed: float | None) -> str:
+    # There are only a few distinct feeds. The type is part of the key
+    # because 200 and 200.0 are formatted differently.
+    return "" if feed is None else f" {Feed(feed)}"
 
 
 class FeedRateCommand(MotionCommand, ABC):
+    __slots__ = ("feed",)
+
     feed: float | None
 
     def __init__(
@@ -245,69 +303,48 @@ class FeedRateCommand(MotionCommand, ABC):
         start: AddressVector,
         arrow=False,
         feed: float | None = None,
-        **kwargs,
     ):
         self.feed = feed
-        super().__init__(end, start, arrow, **kwargs)
+        MotionCommand.__init__(self, end, start, arrow)
 
 
 class Cut(FeedRateCommand):
-    modal = Path.LINEAR
-
-    def __str__(self) -> str:
-        modal = str(self.modal)
-        xyz = str(XYZ(self.end))
-        feed = str(Feed(self.feed))
-        words = [modal, xyz]
-        if feed != "":
-            words.append(feed)
-
-        # words.append(f"({XYZ(self.start)})")
-
-        return " ".join(words)
-
-    def to_ais_shape(self, as_edges=False, alt_color=False) -> AIS_Shape:
-        x = self.start.x if self.start.x is not None else 0
-        y = self.start.y if self.start.y is not None else 0
-        z = self.start.z if self.start.z is not None else 0
-
-        start = cq.Vector(x, y, z)
-        end = self.end.to_vector(start)
-
-        if start == end:
-            return None
-
-        if as_edges:
-            return cq.Edge.makeLine(start, end)
+    __slots__ = ()
 
-        shape = AIS_Line(
-            Geom_CartesianPoint(start.toPnt()), Geom_CartesianPoint(end.toPnt())
-        )
-        if self.arrow:
-            shape.Attributes().SetLineArrowDraw(True)
+    modal = Path.LINEAR
 
-        shape.SetColor(
-            cached_occ_color(self.ais_alt_color if alt_color else self.ais_color)
-        )
+    def to_gcode(self, xyz: str | None = None) -> str:
+        xyz = XYZ.format(self.end) if xyz is None else xyz
+        return f"{self._modal_str} {xyz}{feed_word(self.feed)}"
 
-        return shape
+    to_ais_shape = linear_ais_shape
 
 
 class PlungeCut(Cut):
+    __slots__ = ()
+
     ais_color = "yellow"
 
-    def __init__(self, end, start, **kwargs):
+    def __init__(
+        self,
+        end: AddressVector,
+        start: AddressVector | None,
+        arrow=False,
+        feed: float | None = None,
+    ):
         if end.x is not None or end.y is not None:
             raise RuntimeError("Plunge can only operate on z axis")
-        super().__init__(end, start, **kwargs)
+        FeedRateCommand.__init__(self, end, start, arrow, feed)
 
     @classmethod
     def abs(cls, z=None, start: AddressVector | None = None, **kwargs):
-        return cls(end=AddressVector(z=z), start=start, **kwargs)
+        return cls(end=AddressVector(None, None, z), start=start, **kwargs)
 
 
 # CIRCULAR MOTION
 class Circular(FeedRateCommand, ABC):
+    __slots__ = ("center", "mid", "_center_offset")
+
     center: AddressVector
     mid: AddressVector
 
@@ -315,28 +352,50 @@ class Circular(FeedRateCommand, ABC):
         self,
         center: AddressVector,
         mid: AddressVector,
-        **kwargs,
+        end: AddressVector,
+        start: AddressVector,
+        arrow=False,
+        feed: float | None = None,
     ):
         self.center = center
         self.mid = mid
-        super().__init__(**kwargs)
+        FeedRateCommand.__init__(self, end, start, arrow, feed)
 
-    def __str__(self) -> str:
-        modal = str(self.modal)
-        xyz = str(XYZ(self.end))
-        center = self.center.to_vector(self.start, relative=True)
-        ijk = str(IJK(center))
-        feed = str(Feed(self.feed))
-        words = [modal, xyz, ijk]
-        if feed != "":
-            words.append(feed)
-
-        # words.append(f"({XYZ(self.start)})")
-        return " ".join(words)
+        # Both ends are known at this point, see `center_offset`
+        start = self.start
+        if start.x is None or start.y is None or start.z is None:
+            self._center_offset = None
+        else:
+            self._center_offset = AddressVector(
+                0 if center.x is None else center.x - start.x,
+                0 if center.y is None else center.y - start.y,
+                0 if center.z is None else center.z - start.z,
+            )
+
+    def to_gcode(self, xyz: str | None = None, ijk: str | None = None) -> str:
+        """
+        :param ijk: the center words when they have already been formatted
+        """
+        xyz = XYZ.format(self.end) if xyz is None else xyz
+        if ijk is None:
+            ijk = IJK.format(self.center_offset())
+        return f"{self._modal_str} {xyz} {ijk}{feed_word(self.feed)}"
+
+    def center_offset(self) -> AddressVector:
+        """Center relative to the start, which is what the arc is emitted with"""
+        if self._center_offset is None:
+            self._center_offset = AddressVector(
+                *self.center.to_floats(self.start, relative=True)
+            )
+        return self._center_offset
 
     def to_ais_shape(self, as_edges=False, alt_color=False) -> AIS_Shape:
-        end = self.end.to_vector(self.start)
-        mid = self.mid.to_vector(self.start)
+        # The end points are shared with the neighbouring commands, so
+        # their OCCT points are reused
+        start = self.start.filled(ORIGIN)
+        end = self.end.filled(start).to_pnt()
+        mid = self.mid.filled(start).to_pnt()
+        start = start.to_pnt()
 
         # Note: precision of __eq__ on vectors can cause false positive circles with very small arcs
         # TODO: Neutralise small arcs, these can cause similar problem with grbl as far as I remember
@@ -347,36 +406,50 @@ class Circular(FeedRateCommand, ABC):
         #
         #    edge = cq.Edge.makeCircle(radius, center, cq.Vector(0,0,1))
         # else:
-        try:
-            edge = cq.Edge.makeThreePointArc(self.start, mid, end)
-        except:
-            try:
-                edge = cq.Edge.makeLine(self.start, end)
-            except:
-                # Too small to render ?
-                return None
+        if start.IsEqual(end, LINEAR_TOLERANCE):
+            # Too small to render ?
+            return None
+
+        chord = gp_Vec(start, end)
+        if (
+            gp_Vec(start, mid).Crossed(chord).Magnitude()
+            <= LINEAR_TOLERANCE * chord.Magnitude()
+        ):
+            # The arc is indistinguishable from its chord
+            edge = cq.Edge(BRepBuilderAPI_MakeEdge(start, end).Edge())
+        else:
+            # Same as `cq.Edge.makeThreePointArc` without converting the points
+            arc = GC_MakeArcOfCircle(start, mid, end)
+            if arc.IsDone():
+                edge = cq.Edge(BRepBuilderAPI_MakeEdge(arc.Value()).Edge())
+            else:
+                edge = cq.Edge(BRepBuilderAPI_MakeEdge(start, end).Edge())
         if as_edges:
             return edge
         shape = AIS_Shape(edge.wrapped)
-        shape.SetColor(
-            cached_occ_color(self.ais_alt_color if alt_color else self.ais_color)
-        )
+        shape.SetColor(self.occ_color(alt_color))
         return shape
 
 
 class CircularCW(Circular):
+    __slots__ = ()
+
     modal = Path.ARC_CW
 
 
 class CircularCCW(Circular):
+    __slots__ = ()
+
     modal = Path.ARC_CCW
 
 
 class ConfigCommand(Command, ABC):
-    pass
+    __slots__ = ()
 
 
 class StartSequence(ConfigCommand):
+    __slots__ = ("speed", "coolant", "_str")
+
     speed: int | None
     coolant: CoolantState | None
 
@@ -385,21 +458,30 @@ class StartSequence(ConfigCommand):
     ) -> None:
         self.speed = speed
         self.coolant = coolant
-        super().__init__()
 
-    def __str__(self) -> str:
-        words = [f"{CutterState.ON_CW}"]
+        words = [CutterState.ON_CW]
 
-        if self.speed is not None:
-            words.append(f"{Speed(self.speed)}")
+        if speed is not None:
+            words.append(str(Speed(speed)))
 
-        if self.coolant is not None:
-            words.append(f"{self.coolant}")
+        if coolant is not None:
+            words.append(coolant)
 
-        return " ".join(words)
+        # Format only once, like `ToolChange`
+        self._str = " ".join(words)
+        super().__init__()
+
+    def __str__(self) -> str:
+        return self._str
 
 
 class StopSequence(ConfigCommand):
+    __slots__ = ("coolant",)
+
+    # Only the presence of coolant changes the block
+    _str = str(CutterState.OFF)
+    _str_coolant = f"{CutterState.OFF} {CoolantState.OFF}"
+
     coolant: CoolantState | None
 
     def __init__(self, coolant: CoolantState | None = None):
@@ -407,42 +489,48 @@ class StopSequence(ConfigCommand):
         super().__init__()
 
     def __str__(self) -> str:
-        words = [f"{CutterState.OFF}"]
         if self.coolant is not None:
-            words.append(f"{CoolantState.OFF}")
-
-        return " ".join(words)
+            return self._str_coolant
+        return self._str
 
 
 class SafetyBlock(ConfigCommand):
-    def __str__(self) -> str:
-        return "\n".join(
-            (
-                " ".join(
-                    (
-                        str(DistanceMode.ABSOLUTE),
-                        # str(ArcDistanceMode.INCREMENTAL),
-                        str(WorkOffset.OFFSET_1),
-                        str(PlannerControlMode.CONTINUOUS),
-                        str(SpindleControlMode.MAX_SPINDLE_SPEED),
-                        str(WorkPlane.XY),
-                        str(FeedRateControlMode.UNITS_PER_MINUTE),
-                    )
-                ),
-                " ".join(
-                    (
-                        str(LengthCompensation.OFF),
-                        str(RadiusCompensation.OFF),
-                        str(CannedCycle.CANCEL),
-                    )
-                ),
-                str(Unit.METRIC),
-                str(Position.SECONDARY_HOME),
-            )
+    __slots__ = ()
+
+    # The block has no parameters, so it is formatted only once. The group
+    # members are strings and can be joined as they are.
+    _str = "\n".join(
+        (
+            " ".join(
+                (
+                    DistanceMode.ABSOLUTE,
+                    # ArcDistanceMode.INCREMENTAL,
+                    WorkOffset.OFFSET_1,
+                    PlannerControlMode.CONTINUOUS,
+                    SpindleControlMode.MAX_SPINDLE_SPEED,
+                    WorkPlane.XY,
+                    FeedRateControlMode.UNITS_PER_MINUTE,
+                )
+            ),
+            " ".join(
+                (
+                    LengthCompensation.OFF,
+                    RadiusCompensation.OFF,
+                    CannedCycle.CANCEL,
+                )
+            ),
+            Unit.METRIC,
+            Position.SECONDARY_HOME,
         )
+    )
+
+    def __str__(self) -> str:
+        return self._str
 
 
 class ToolChange(ConfigCommand):
+    __slots__ = ("tool_number", "speed", "coolant", "_str")
+
     tool_number: int | None
     speed: int | None
     coolant: CoolantState | None
@@ -456,23 +544,25 @@ class ToolChange(ConfigCommand):
         self.tool_number = tool_number
         self.speed = speed
         self.coolant = coolant
-
-        super().__init__()
-
-    def __str__(self) -> str:
-        return "\n".join(
+        # Tool changes are emitted as they were constructed, format only once
+        self._str = "\n".join(
             (
-                str(StopSequence(self.coolant)),
-                str(Position.SECONDARY_HOME),
-                str(ProgramControlMode.PAUSE_OPTIONAL),
+                str(StopSequence(coolant)),
+                Position.SECONDARY_HOME,
+                ProgramControlMode.PAUSE_OPTIONAL,
                 " ".join(
                     (
-                        f"{ToolNumber(self.tool_number)}",
-                        str(LengthCompensation.ON),
-                        f"{ToolLengthOffset(self.tool_number)}",
-                        str(AutomaticChangerMode.TOOL_CHANGE),
+                        str(ToolNumber(tool_number)),
+                        LengthCompensation.ON,
+                        str(ToolLengthOffset(tool_number)),
+                        AutomaticChangerMode.TOOL_CHANGE,
                     )
                 ),
-                str(StartSequence(self.speed, self.coolant)),
+                str(StartSequence(speed, coolant)),
             )
         )
+
+        super().__init__()
+
+    def __str__(self) -> str:
+        return self._str
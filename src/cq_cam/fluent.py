@@ -1,12 +1,27 @@
 from __future__ import annotations
 
+import io
 import logging
 from copy import copy
-from typing import Union
+from functools import cache
+from itertools import groupby
+from typing import Iterator, TextIO, Union
 
 from cadquery import cq
 
-from cq_cam.command import Command, SafetyBlock, StartSequence, StopSequence, ToolChange
+from cq_cam.address import IJK, XYZ, AddressVector, suppress_unchanged
+from cq_cam.command import (
+    Circular,
+    Command,
+    Cut,
+    MotionCommand,
+    RapidCommand,
+    SafetyBlock,
+    StartSequence,
+    StopSequence,
+    ToolChange,
+    feed_word,
+)
 from cq_cam.groups import (
     ArcDistanceMode,
     CoolantState,
@@ -35,19 +50,124 @@ class Operation:
         self.commands = commands
 
     def to_gcode(self):
+        return "\n".join(self.gcode_lines())
+
+    def write_gcode(self, f: TextIO):
+        """Write the g-code to `f` as it is generated, one run of commands at a time"""
+        first = True
+        for lines in self._gcode_runs():
+            if not first:
+                f.write("\n")
+            f.write("\n".join(lines))
+            first = False
+
+    def gcode_lines(self) -> Iterator[str]:
+        for lines in self._gcode_runs():
+            yield from lines
+
+    def _gcode_runs(self) -> Iterator[list[str]]:
         # Set starting position above rapid height so that
         # we guarantee getting the correct Z rapid in the beginning
-        gcodes = [f"({self.job.name} - {self.name})"]
+        yield [f"({self.job.name} - {self.name})"]
+
+        # Format the words of every motion command in one go
+        motion_commands = []
+        # Whether each motion command follows a non-motion command, which
+        # may have changed the machine state, so its words are always kept
+        restarts = []
+        restart = True
         for command in self.commands:
-            gcode = str(command)
+            if _batch_emitter(command):
+                motion_commands.append(command)
+                restarts.append(restart)
+                restart = False
+            else:
+                restart = True
+        arcs = [
+            command
+            for command in motion_commands
+            if _batch_emitter(command) is Circular
+        ]
+        ends = AddressVector.to_array(command.end for command in motion_commands)
+        if self.job.modal_gcode:
+            ends = suppress_unchanged(ends, restarts=restarts)
+        xyzs = iter(XYZ.format_batch(ends))
+        ijks = iter(
+            IJK.format_batch(
+                AddressVector.to_array(arc.center_offset() for arc in arcs)
+            )
+        )
+
+        modal_state = _ModalState()
+        for emitter, run in groupby(self.commands, key=_batch_emitter):
+            if emitter is None:
+                # Skip blank lines. These can happen for example if we try to issue
+                # a move to the same position where we already are
+                lines = [gcode for gcode in map(str, run) if gcode]
+                if lines:
+                    yield lines
+                # Don't assume anything about the machine state after these
+                modal_state = _ModalState()
+            elif self.job.modal_gcode:
+                lines = [
+                    modal_state.to_gcode(
+                        command, next(xyzs), next(ijks) if emitter is Circular else ""
+                    )
+                    for command in run
+                ]
+                lines = [gcode for gcode in lines if gcode]
+                if lines:
+                    yield lines
+            elif emitter is Circular:
+                yield [arc.to_gcode(next(xyzs), next(ijks)) for arc in run]
+            else:
+                yield [command.to_gcode(next(xyzs)) for command in run]
+
+
+def _batch_emitter(command: Command) -> type[MotionCommand] | None:
+    return _class_batch_emitter(type(command))
+
+
+@cache
+def _class_batch_emitter(cls: type[Command]) -> type[MotionCommand] | None:
+    # Resolved once per class, the ABC instance checks are comparatively slow
+    for emitter in (RapidCommand, Cut, Circular):
+        if issubclass(cls, emitter):
+            return emitter
+    return None
 
-            # Skip blank lines. These can happen for example if we try to issue
-            # a move to the same position where we already are
-            if not gcode:
-                continue
-            gcodes.append(gcode)
 
-        return "\n".join(gcodes)
+class _ModalState:
+    """
+    Motion mode and feed of the previously emitted motion command. Both
+    stay in effect until changed, so repeating them can be left out.
+    """
+
+    __slots__ = ("modal", "feed")
+
+    def __init__(self):
+        self.modal = None
+        self.feed = None
+
+    def to_gcode(self, command: MotionCommand, xyz: str, ijk: str) -> str:
+        """
+        :return: the block, blank when the command has no axis words
+        """
+        if not xyz:
+            # Nothing to move to, and a motion word alone is an error
+            return ""
+
+        words = [xyz, ijk] if ijk else [xyz]
+        if command._modal_str != self.modal:
+            self.modal = command._modal_str
+            words.insert(0, self.modal)
+
+        gcode = " ".join(words)
+        feed = getattr(command, "feed", None)
+        if feed is not None and feed != self.feed:
+            self.feed = feed
+            gcode += feed_word(feed)
+        return gcode
 
 
 class Job:
@@ -70,6 +190,7 @@ class Job:
         arc_distance: ArcDistanceMode = ArcDistanceMode.ABSOLUTE,
         controller_motion: PlannerControlMode = PlannerControlMode.CONTINUOUS,
         coolant: CoolantState | None = None,
+        modal_gcode: bool = False,
     ):
         self.top = top
         self.top_plane_face = cq.Face.makePlane(None, None, top.origin, top.zDir)
@@ -95,6 +216,8 @@ class Job:
         self.arc_distance = arc_distance
         self.controller_motion = controller_motion
         self.coolant = coolant
+        # Leave out motion words that repeat those of the previous motion
+        self.modal_gcode = modal_gcode
 
         self.max_stepdown_count = 100
 
@@ -271,21 +394,31 @@ class Job:
         return 0.04
 
     def to_gcode(self):
-        task_break = "\n\n\n"
-        return (
+        gcode = io.StringIO()
+        self.write_gcode(gcode)
+        return gcode.getvalue()
+
+    def write_gcode(self, f: TextIO):
+        """Write the g-code program to `f` one operation at a time"""
+        f.write(
             f"({self.name} - Feedrate: {self.feed} - Unit: {repr(self.unit)})\n"
             f"{SafetyBlock()}\n"
             f"{StartSequence(speed=self.speed, coolant=self.coolant)}\n"
-            f"{task_break.join(task.to_gcode() for task in self.operations)}\n"
+        )
+        for i, task in enumerate(self.operations):
+            if i:
+                f.write("\n\n\n")
+            task.write_gcode(f)
+        f.write(
+            "\n"
             f"{SafetyBlock()}\n"
             f"{StopSequence(coolant=self.coolant)}\n"
             f"{ProgramControlMode.END_RESET}"
         )
 
     def save_gcode(self, file_name):
-        gcode = str(self)
         with open(file_name, "w") as f:
-            f.write(gcode)
+            self.write_gcode(f)
 
     def show(self, show_object=None):
         if show_object is None:
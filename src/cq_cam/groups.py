@@ -3,7 +3,7 @@
 G-code commands can be categorized as modal or non-modal. Modal commands remain in effect until they are replaced or cancelled by another command. Non-modal commands execute in their block scope. M-code and G-code are further organized into modal groups
 
 G-code Modal Groups:
-- Group 0 - Non-modal codes: G4, G10 G28, G30, G52, G53, G92, G92.1, G92.2, G92.3 
+- Group 0 - Non-modal codes: G4, G10 G28, G30, G52, G53, G92, G92.1, G92.2, G92.3
 - Group 1 - Motion: G0, G1, G2, G3, G38.n, G80, G81, G82, G83, G84, G85, G86, G87, G88, G89
 - Group 2 - Plane: G17, G18, G19, G17.1, G18.1, G19.1
 - Group 3 - Distance Mode: G90, G91
@@ -26,7 +26,12 @@ M-code Modal Groups:
 from enum import Enum
 
 
-class GCodeGroup(Enum):
+class GCodeGroup(str, Enum):
+    """
+    The codes are plain strings as well, so they can be joined into
+    lines without going through the Enum formatting.
+    """
+
     def __repr__(self):
         return f"{self.__class__.__name__}.{self._name_}"
 
@@ -7,7 +7,7 @@ from cq_cam.address import AddressVector
 from cq_cam.command import PlungeCut, Rapid
 from cq_cam.operations.base_operation import Operation, OperationError
 from cq_cam.operations.strategy import Strategy
-from cq_cam.utils.utils import flatten_list
+from cq_cam.utils.utils import flatten_list, plane_to_world_coords
 
 _op_o_shapes = Union[cq.Wire, cq.Face, cq.Vector]
 
@@ -24,7 +24,6 @@ class Drill(Operation):
     def __post_init__(self):
         # TODO max depth
         # TODO evacuate chips?
-        transform_f = self.job.top.toWorldCoords
         drill_vectors: list[cq.Vector] = []
 
         if self.o is None:
@@ -35,18 +34,18 @@ class Drill(Operation):
 
         for obj in self._o_objects(self.o):
             if isinstance(obj, cq.Vector):
-                drill_vectors.append(transform_f(obj))
+                drill_vectors.append(obj)
             elif isinstance(obj, cq.Wire):
-                drill_vectors.append(transform_f(cq.Face.makeFromWires(obj).Center()))
+                drill_vectors.append(cq.Face.makeFromWires(obj).Center())
             elif isinstance(obj, cq.Face):
-                if obj.innerWires():
-                    for wire in obj.innerWires():
-                        drill_vectors.append(
-                            transform_f(cq.Face.makeFromWires(wire).Center())
-                        )
+                # Explore the inner wires only once per face
+                inner_wires = obj.innerWires()
+                if inner_wires:
+                    for wire in inner_wires:
+                        drill_vectors.append(cq.Face.makeFromWires(wire).Center())
                 else:
                     drill_vectors.append(
-                        transform_f(cq.Face.makeFromWires(obj.outerWire()).Center())
+                        cq.Face.makeFromWires(obj.outerWire()).Center()
                     )
             else:
                 raise OperationError(
@@ -56,7 +55,10 @@ class Drill(Operation):
         if not drill_vectors:
             raise OperationError("Given wp does not contain anything to do")
 
-        drill_points = [(point.x, point.y) for point in drill_vectors]
+        world_points = plane_to_world_coords(
+            self.job.top, [vector.toTuple() for vector in drill_vectors]
+        )
+        drill_points = [tuple(point) for point in world_points[:, :2].tolist()]
         ordered_drill_points = []
         cut_sequences = []
         last = None
@@ -1,3 +1,4 @@
+import math
 from dataclasses import dataclass
 
 import cadquery as cq
@@ -27,6 +28,21 @@ class Surface3D(FaceBaseOperation):
     def _tool_diameter(self) -> float:
         return self.tool.getDiameter()
 
+    @staticmethod
+    def _step_depths(
+        top_height: float, bottom_height: float, stepdown: float
+    ) -> list[float]:
+        """
+        Layer depths from just below `top_height` down to `bottom_height`,
+        which is always the last layer
+        """
+        step = abs(stepdown)
+        # Count the layers with integers, float stepping with np.arange can
+        # produce an extra layer right above the bottom
+        count = math.ceil((top_height - bottom_height) / step - 1e-9)
+        layers = top_height - step * np.arange(1, max(count, 1))
+        return layers.tolist() + [bottom_height]
+
     def __post_init__(self):
         """
         The 3D job can work very similar to 2D pocket:
@@ -62,17 +78,15 @@ class Surface3D(FaceBaseOperation):
 
             def interpolate_cut_sequence(cut_sequence):
                 interpolated = [cut_sequence[0]]
-                v1 = cq.Vector(cut_sequence[0])
-                for p2 in cut_sequence[1:]:
-                    v2 = cq.Vector(p2)
-                    v = v2 - v1
-                    u = v.normalized()
-                    l = v.Length
-                    for step in np.arange(0, l, self.interpolation_step):
-                        step_v = v1 + u * step
-                        interpolated.append((step_v.x, step_v.y))
+                points = np.asarray(cut_sequence, dtype=float)
+                for p1, v, p2 in zip(points, np.diff(points, axis=0), cut_sequence[1:]):
+                    l = np.sqrt(v[0] * v[0] + v[1] * v[1])
+                    if l:
+                        steps = np.arange(0, l, self.interpolation_step)
+                        # Same as stepping p1 + v.normalized() * step
+                        step_points = p1 + (v / l) * steps[:, None]
+                        interpolated += map(tuple, step_points.tolist())
                     interpolated.append(p2)
-                    v1 = v2
                 return interpolated
 
             # Note, this interpolation doesn't consider depth at all
@@ -113,13 +127,9 @@ class Surface3D(FaceBaseOperation):
 
             bottom_height = bb.zmin
             if self.stepdown:
-                depths = list(
-                    np.arange(
-                        self.top_height + self.stepdown, bottom_height, self.stepdown
-                    )
+                depths = self._step_depths(
+                    self.top_height, bottom_height, self.stepdown
                 )
-                if depths[-1] != bottom_height:
-                    depths.append(bottom_height)
             else:
                 depths = [bottom_height]
 
@@ -135,31 +145,30 @@ class Surface3D(FaceBaseOperation):
                 # TODO if there is a new cut sequence within radius of max_step then use it without retracting
                 for cut_sequence in depth_cut_sequences:
                     cut_start = cut_sequence[0]
-                    self.commands.append(
-                        Rapid.abs(z=self.job.rapid_height, start=previous_pos)
-                    )
-                    previous_pos = self.commands[-1].end
-                    self.commands.append(
-                        Rapid.abs(x=cut_start[0], y=cut_start[1], start=previous_pos)
+                    # Collect the sequence locally and extend the command list
+                    # once, chaining each command start to the previous end
+                    commands = [Rapid.abs(z=self.job.rapid_height, start=previous_pos)]
+                    commands.append(
+                        Rapid.abs(
+                            x=cut_start[0], y=cut_start[1], start=commands[-1].end
+                        )
                     )
-                    previous_pos = self.commands[-1].end
-                    self.commands.append(
-                        Rapid.abs(z=self.job.op_safe_height, start=previous_pos)
+                    commands.append(
+                        Rapid.abs(z=self.job.op_safe_height, start=commands[-1].end)
                     )  # TODO plunge or rapid?
-                    previous_pos = self.commands[-1].end
-                    # self.commands.append(PlungeCut.abs(
-                    #     z=cut_start[2], start=previous_pos))
-                    # previous_pos = self.commands[-1].end
+                    # commands.append(PlungeCut.abs(
+                    #     z=cut_start[2], start=commands[-1].end))
+                    previous_pos = commands[-1].end
                     for cut in cut_sequence[1:]:
-                        self.commands.append(
-                            Cut.abs(
-                                x=cut[0],
-                                y=cut[1],
-                                z=max(depth, cut[2]),
-                                start=previous_pos,
-                            )
+                        command = Cut.abs(
+                            x=cut[0],
+                            y=cut[1],
+                            z=max(depth, cut[2]),
+                            start=previous_pos,
                         )
-                        previous_pos = self.commands[-1].end
+                        commands.append(command)
+                        previous_pos = command.end
+                    self.commands += commands
 
         # for i, base_boundary in enumerate(base_boundaries):
         #    show_object(base_boundary, f'base_boundary-{i}')
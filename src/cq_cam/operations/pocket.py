@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Literal
 
 import cadquery as cq
 import numpy as np
+import shapely
 
 from cq_cam.address import AddressVector
 from cq_cam.operations.pocket_cq import pocket_cq
@@ -16,6 +17,8 @@ from cq_cam.utils.geometry_op import (
     difference_poly_tree,
     offset_path,
     offset_polyface,
+    overlapping_paths,
+    scale_paths,
     union_poly_tree,
 )
 from cq_cam.utils.tree import Tree
@@ -115,14 +118,18 @@ def combine_outers(poly_faces: list[PathFace], depth) -> list[Path]:
 def determine_stepdown_start_depth(
     pocket_op: PathFace, shallower_pocket_ops: list[PathFace]
 ) -> float | None:
+    if not shallower_pocket_ops:
+        return None
+
+    # Test all the shallower polygons with a single vectorized shapely call
+    contains = shapely.contains(
+        [op.polygon for op in shallower_pocket_ops], pocket_op.polygon
+    )
     stepdown_start_depth = [
-        op.depth
-        for op in shallower_pocket_ops
-        if op.polygon.contains(pocket_op.polygon)
+        op.depth for op, contained in zip(shallower_pocket_ops, contains) if contained
     ]
     if stepdown_start_depth:
-        stepdown_start_depth.sort()
-        return stepdown_start_depth[0]
+        return min(stepdown_start_depth)
     else:
         return None
 
@@ -155,15 +162,20 @@ def build_pocket_ops(
     depth_map, depths = generate_depth_map(op_areas)
     avoid_depth_map, avoid_depths = generate_depth_map(avoid_areas)
 
-    pocket_ops = []
-    # Iterate though each depth and construct the depth geometry
-    for i, depth in enumerate(depths):
+    depth_pocket_ops = {}
+    # Iterate from the deepest depth upwards so that the union of deeper
+    # outers can be carried over instead of being recomputed at every depth
+    deeper_outers: list[Path] = []
+    deeper_inners: list[Path] = []
+    for depth in reversed(depths):
         depth_faces = depth_map[depth]
-        for sub_depth in depths[i + 1 :]:
-            depth_faces += depth_map[sub_depth]
-
-        depth_ops = combine_outers(depth_faces, depth)
+        depth_ops = combine_outers(
+            [PathFace(outer, [], depth) for outer in deeper_outers] + depth_faces,
+            depth,
+        )
         depth_inners = flatten_list(face.inners for face in depth_faces)
+        depth_inners += deeper_inners
+        deeper_outers, deeper_inners = depth_ops, depth_inners
 
         if avoid_depths:
             active_avoid_depths = [
@@ -177,21 +189,25 @@ def build_pocket_ops(
             # A limitation here is that avoids only work with the outer polygon
             # Technically pyclipper does support multiple depths, so this could
             # be investigated further
-            depth_ops_with_avoid = difference_poly_tree(
-                depth_ops, depth_inners + avoid_outers, depth
-            )
-            pocket_ops += depth_ops_with_avoid
-
+            clips = depth_inners + avoid_outers
         else:
-            pocket_ops += difference_poly_tree(depth_ops, depth_inners, depth)
+            clips = depth_inners
+
+        # With many disjoint faces most of the clips lie nowhere near the
+        # outers of this depth, leave them out of the boolean operation
+        depth_pocket_ops[depth] = difference_poly_tree(
+            depth_ops, overlapping_paths(clips, depth_ops), depth
+        )
 
-    return pocket_ops
+    return flatten_list(depth_pocket_ops[depth] for depth in depths)
 
 
 def fill_pocket_contour_shrink(
     pocket: PathFace, step: float, precision: int
 ) -> list[list[PathFace]]:
     tree = Tree(PathFace(pocket.outer, [], depth=pocket.depth))
+    # The inners stay the same for every step, scale them only once
+    scaled_inners = scale_paths(pocket.inners)
     i = 0
 
     # TODO sanify the variable names here
@@ -203,7 +219,7 @@ def fill_pocket_contour_shrink(
                 next_outers = [
                     face.outer
                     for face in difference_poly_tree(
-                        next_outer_candidates, pocket.inners, 0
+                        next_outer_candidates, scaled_inners, 0, clips_scaled=True
                     )
                 ]
             else:
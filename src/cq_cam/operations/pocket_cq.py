@@ -58,29 +58,30 @@ def build_pocket_ops(
     depth_map, depths = generate_depth_map(op_areas)
     avoid_depth_map, avoid_depths = generate_depth_map(avoid_areas)
 
+    # The job plane normal is constant, fetch it only once
+    z_dir = job.top.zDir
+
     pocket_ops = []
     # Iterate though each depth and construct the depth geometry
     for i, depth in enumerate(depths):
-        depth_faces = depth_map[depth]
+        # Copy so that the depth map is not extended in place
+        depth_faces = list(depth_map[depth])
         for sub_depth in depths[i + 1 :]:
             # Move faces UP
-            depth_faces += [
-                face.translate(job.top.zDir.multiply(depth - sub_depth))
-                for face in depth_map[sub_depth]
-            ]
+            offset = z_dir.multiply(depth - sub_depth)
+            depth_faces += [face.translate(offset) for face in depth_map[sub_depth]]
 
         depth_ops = combine_faces(depth_faces)
 
         if avoid_depths:
-            active_avoid_depths = [
-                avoid_depth for avoid_depth in avoid_depths if avoid_depth >= depth
-            ]
             avoid_faces = []
-            for avoid_depth in active_avoid_depths:
+            for avoid_depth in avoid_depths:
+                if avoid_depth < depth:
+                    continue
                 # Move faces DOWN
+                offset = z_dir.multiply(depth - avoid_depth)
                 avoid_faces += [
-                    face.translate(job.top.zDir.multiply(depth - avoid_depth))
-                    for face in avoid_depth_map[avoid_depth]
+                    face.translate(offset) for face in avoid_depth_map[avoid_depth]
                 ]
             depth_ops_with_avoid = []
             for i, depth_op in enumerate(depth_ops):
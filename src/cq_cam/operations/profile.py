@@ -99,6 +99,9 @@ def apply_tabs(wire: cq.Wire, tab_z: float, tabs: Tabs):
         return wire
 
     tab_plane = cq.Plane((0, 0, tab_z))
+    # Constant for every tab, build the OCCT objects only once
+    tab_geom_plane = Geom_Plane(tab_plane.toPln())
+    tab_projection_dir = cq.Vector(0, 0, -1).toDir()
 
     edges = wire_to_ordered_edges(wire)
     if getattr(tabs, "load_wire", None):
@@ -113,19 +116,19 @@ def apply_tabs(wire: cq.Wire, tab_z: float, tabs: Tabs):
             continue
 
         previous_edge = None
+        curve = edge._geomAdaptor().Curve().Curve()
         for t_start, t_end in zip(transitions, transitions[1:]):
             t_start_p, t_end_p, e_reversed = edge_oriented_param(
                 edge, t_start[0], t_end[0]
             )
             p1 = edge.paramAt(t_start_p)
             p2 = edge.paramAt(t_end_p)
-            curve = edge._geomAdaptor().Curve().Curve()
 
             if t_start[1] == Transition.TAB:
                 projected_curve = GeomProjLib.ProjectOnPlane_s(
                     curve,
-                    Geom_Plane(tab_plane.toPln()),
-                    cq.Vector(0, 0, -1).toDir(),
+                    tab_geom_plane,
+                    tab_projection_dir,
                     True,
                 )
                 projected_edge = cq.Edge(
@@ -1,11 +1,15 @@
 import logging
-from itertools import pairwise
 
 import cadquery as cq
 import numpy as np
 
 from cq_cam.utils.linked_polygon import LinkedPolygon
-from cq_cam.utils.utils import WireClipper, cached_dist2, dist_to_segment_squared
+from cq_cam.utils.utils import (
+    WireClipper,
+    dist2,
+    dist_to_segment_squared_batch,
+    pairwise_closed_array,
+)
 
 Scanpoint = tuple[float, float]
 Scanline = list[Scanpoint]
@@ -22,11 +26,11 @@ class Strategy:
     def _pick_nearest(
         point: tuple[float, float], options: list[tuple[float, float]]
     ) -> tuple[float, float]:
-        nearest = (cached_dist2(point, options[0]), options[0])
+        nearest = (dist2(point, options[0]), options[0])
         for option in options[1:]:
-            dist2 = cached_dist2(point, option)
-            if dist2 < nearest[0]:
-                nearest = (dist2, option)
+            option_dist2 = dist2(point, option)
+            if option_dist2 < nearest[0]:
+                nearest = (option_dist2, option)
         return nearest[1]
 
     @classmethod
@@ -80,19 +84,17 @@ class ZigZagStrategy(Strategy):
         max_bounds = clipper.max_bounds()
 
         # Generate ZigZag scanlines
-        y_scanpoints = list(
-            np.arange(
-                max_bounds["bottom"],
-                max_bounds["top"],
-                task._tool_diameter * task.stepover,
-            )
+        y_scanpoints = np.arange(
+            max_bounds["bottom"],
+            max_bounds["top"],
+            task._tool_diameter * task.stepover,
         )
-        scanline_templates = [
-            ((max_bounds["left"], y), (max_bounds["right"], y)) for y in y_scanpoints
-        ]
+        scanline_templates = np.empty((len(y_scanpoints), 2, 2))
+        scanline_templates[:, 0, 0] = max_bounds["left"]
+        scanline_templates[:, 1, 0] = max_bounds["right"]
+        scanline_templates[:, :, 1] = y_scanpoints[:, None]
 
-        for scanline_template in scanline_templates:
-            clipper.add_subject_polygon(scanline_template)
+        clipper.add_subject_polygons(scanline_templates)
 
         scanlines = clipper.execute()
 
@@ -129,22 +131,24 @@ class ZigZagStrategy(Strategy):
     def _link_scanpoints_to_boundaries(
         scanpoints: list[Scanpoint], boundaries: list[list[tuple[float, float]]]
     ):
-        remaining_scanpoints = scanpoints[:]
+        points = np.asarray(scanpoints, dtype=float).reshape(-1, 2)
+        remaining = np.ones(len(scanpoints), dtype=bool)
         scanpoint_to_linked_polygon = {}
         linked_polygons = []
         for polygon in boundaries:
             linked_polygon = LinkedPolygon(polygon[:])
             linked_polygons.append(linked_polygon)
-            for p1, p2 in pairwise(polygon):
-                for scanpoint in remaining_scanpoints[:]:
-                    d, _ = dist_to_segment_squared(scanpoint, p1, p2)
-                    # Todo pick a good number. Tests show values between 1.83e-19 and 1.38e-21
-                    if d < 0.0000001:
-                        remaining_scanpoints.remove(scanpoint)
-                        linked_polygon.link_point(scanpoint, p1, p2)
-                        scanpoint_to_linked_polygon[scanpoint] = linked_polygon
-
-        assert not remaining_scanpoints
+            for p1, p2 in pairwise_closed_array(polygon).tolist():
+                p1, p2 = tuple(p1), tuple(p2)
+                d = dist_to_segment_squared_batch(points, p1, p2)
+                # Todo pick a good number. Tests show values between 1.83e-19 and 1.38e-21
+                for i in np.flatnonzero(remaining & (d < 0.0000001)):
+                    remaining[i] = False
+                    scanpoint = scanpoints[i]
+                    linked_polygon.link_point(scanpoint, p1, p2)
+                    scanpoint_to_linked_polygon[scanpoint] = linked_polygon
+
+        assert not remaining.any()
         return linked_polygons, scanpoint_to_linked_polygon
 
     @staticmethod
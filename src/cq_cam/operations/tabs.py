@@ -60,8 +60,8 @@ class EdgeTabs(Tabs):
                 continue
 
             half_d = 1 / length * half
-            for d in np.linspace(0, 1, count + 2, endpoint=True)[1:-1]:
-                edge_ds.append((d - half_d, d + half_d))
+            ds = np.linspace(0, 1, count + 2, endpoint=True)[1:-1]
+            edge_ds.extend(zip((ds - half_d).tolist(), (ds + half_d).tolist()))
 
     def edge_tab_transitions(self, edge_index):
         edge_ds = self.edges_ds[edge_index]
@@ -103,17 +103,8 @@ class WireTabs(Tabs):
 
     def load_ordered_edges(self, ordered_edges):
         edge_lengths = [edge.Length() for edge in ordered_edges]
-        wire_length = sum(edge_lengths)
-        edge_ranges = []
-        previous_range_end = 0
-        for edge_length in edge_lengths:
-            edge_fraction = edge_length / wire_length
-            edge_range_end = previous_range_end + edge_fraction
-            edge_ranges.append((previous_range_end, min(edge_range_end, 1)))
-            previous_range_end = edge_range_end
-
         self.edge_lengths = edge_lengths
-        self.edge_ranges = edge_ranges
+        self.edge_ranges = self.edge_d_ranges(edge_lengths, sum(edge_lengths))
 
     def edge_tab_transitions(self, edge_index):
         edge_range = self.edge_ranges[edge_index]
@@ -146,15 +137,19 @@ class WireTabs(Tabs):
         wire_length = wire.Length()
         edges = wire_to_ordered_edges(wire)
         edge_lengths = [edge.Length() for edge in edges]
-        edge_ranges = []
-        previous_range_end = 0
-        for edge_length in edge_lengths:
-            edge_fraction = edge_length / wire_length
-            edge_range_end = previous_range_end + edge_fraction
-            edge_ranges.append((previous_range_end, min(edge_range_end, 1)))
-            previous_range_end = edge_range_end
+        return edges, WireTabs.edge_d_ranges(edge_lengths, wire_length)
 
-        return edges, edge_ranges
+    @staticmethod
+    def edge_d_ranges(
+        edge_lengths: list[float], wire_length: float
+    ) -> list[tuple[float, float]]:
+        """
+        Convert edge lengths to the (start, end) range each edge covers
+        along the wire, both normalized to the wire length.
+        """
+        range_ends = np.cumsum(np.asarray(edge_lengths, dtype=float) / wire_length)
+        range_starts = np.concatenate(([0.0], range_ends[:-1]))
+        return list(zip(range_starts.tolist(), np.minimum(range_ends, 1).tolist()))
 
     @staticmethod
     def wire_d_to_edge_d(wire_d, edge_range):
@@ -162,7 +157,7 @@ class WireTabs(Tabs):
 
 
 # TODO WireTabs EdgeTabs+ .,n
-if "show_object" in locals() or __name__ == "__main__":
+if __name__ == "__main__":
     box = cq.Workplane().box(5, 5, 5)
     bottom = box.wires("<Z")
     tabs = Tabs(1, 1, 4)
@@ -22,6 +22,7 @@ from cq_cam.utils.interpolation import edge_interpolation_count
 from cq_cam.utils.utils import (
     edge_end_param,
     edge_end_point,
+    edge_positions,
     edge_start_param,
     edge_start_point,
     is_arc_clockwise2,
@@ -163,10 +164,12 @@ def route_edge(
         # CIRCLE geom type does not guarantee that the edge is a full circle!
         # TODO ARC's are not necessarily circular, so the gcode representation can be wrong!
         if edge.Closed():
-            mid1_p, end1_p, mid2_p = np.linspace(start_p, end_p, 5)[1:-1]
-            mid1 = AddressVector.from_vector(edge.positionAt(mid1_p, "parameter"))
-            end1 = AddressVector.from_vector(edge.positionAt(end1_p, "parameter"))
-            start_cv = AddressVector.from_vector(edge.positionAt(start_p, "parameter"))
+            # Evaluate all the split points with a single curve adaptor
+            curve = edge._geomAdaptor()
+            start_cv, mid1, end1, mid2 = (
+                AddressVector(*curve.Value(p).Coord())
+                for p in np.linspace(start_p, end_p, 5)[:-1]
+            )
             commands.append(
                 cmd(
                     center=center,
@@ -178,7 +181,6 @@ def route_edge(
                 )
             )
             start_cv = end1
-            mid2 = AddressVector.from_vector(edge.positionAt(mid2_p, "parameter"))
             commands.append(
                 cmd(
                     center=center,
@@ -216,9 +218,10 @@ def route_edge(
         else:
             i, j = 0, 1
 
-        for length in np.linspace(i, j, n):
+        # Same as edge.positionAt for each length, but with one curve adaptor
+        for position in edge_positions(edge, np.linspace(i, j, n)).tolist():
             # [e._geomAdaptor().Curve().Curve().BasisCurve().BasisCurve() for e in pocket.DEBUG[0].Edges()]
-            end_cv_int = AddressVector.from_vector(edge.positionAt(length))
+            end_cv_int = AddressVector(*position)
             commands.append(
                 Cut(
                     end_cv_int,
@@ -1,4 +1,5 @@
 import cadquery as cq
+import numpy as np
 import pytest
 
 from cq_cam.address import (
@@ -17,6 +18,8 @@ from cq_cam.address import (
     XAxis,
     YAxis,
     ZAxis,
+    format_address,
+    suppress_unchanged,
 )
 
 
@@ -92,3 +95,97 @@ def test_ijk():
     center = center_cv.to_vector(start, relative=True)
     gcode = f"{IJK(center)}"
     assert gcode == "I-5 J-15 K-25"
+
+
+def test_xyz_format_batch():
+    ends = [
+        AddressVector(10.0, 20.0, 30.0),
+        AddressVector(1.0005, -0.0004, 2.675),
+        AddressVector(None, 0.25, None),
+        AddressVector(-3, None, 1e-7),
+    ]
+    points = np.array([(end.x, end.y, end.z) for end in ends], dtype=float)
+    assert XYZ.format_batch(points) == [str(XYZ(end)) for end in ends]
+    assert [XYZ.format(end) for end in ends] == [str(XYZ(end)) for end in ends]
+    assert XYZ.format_batch(points) == [
+        "X10 Y20 Z30",
+        "X1 Y0 Z2.675",
+        "Y0.25",
+        "X-3 Z0",
+    ]
+
+
+def test_ijk_format_batch():
+    centers = np.array([(-5.0, -15.0, -25.0), (1.5, 0.0, 0.0)])
+    assert IJK.format_batch(centers) == ["I-5 J-15 K-25", "I1.5 J0 K0"]
+
+
+def test_format_address():
+    assert format_address(10.0) == "10"
+    assert format_address(-1.25) == "-1.25"
+    assert format_address(2.675) == "2.675"
+    assert format_address(1.0005) == "1"
+    assert format_address(-0.0004) == "0"
+    assert format_address(0.5, precision=0) == "0"
+    assert format_address(12, precision=0) == "12"
+
+
+def test_suppress_unchanged():
+    points = np.array(
+        [
+            (0.0, 0.0, 5.0),
+            (10.0, 0.0, 5.0),
+            (10.0, 0.0, 5.0),
+            (10.0004, 20.0, np.nan),
+            (10.0, 20.0, 1.0),
+        ]
+    )
+    assert XYZ.format_batch(suppress_unchanged(points)) == [
+        "X0 Y0 Z5",
+        "X10",
+        "X10 Y0 Z5",
+        "Y20",
+        "Z1",
+    ]
+
+    # Missing addresses don't count as kept words either
+    points = np.array(
+        [
+            (np.nan, np.nan, 5.0),
+            (np.nan, np.nan, 5.0),
+            (1.0, 2.0, 3.0),
+            (1.0, 2.0, np.nan),
+        ]
+    )
+    assert XYZ.format_batch(suppress_unchanged(points)) == [
+        "Z5",
+        "Z5",
+        "X1 Y2 Z3",
+        "X1 Y2",
+    ]
+
+
+def test_address_to_pnt():
+    address = AddressVector(1.0, 2.0, 3.0)
+    pnt = address.to_pnt()
+    assert (pnt.X(), pnt.Y(), pnt.Z()) == (1.0, 2.0, 3.0)
+    assert address.to_pnt() is pnt
+
+
+def test_address_filled():
+    address = AddressVector(1.0, None, 3.0)
+    filled = address.filled(AddressVector(4.0, 5.0, 6.0))
+    assert filled == AddressVector(1.0, 5.0, 3.0)
+    assert address == AddressVector(1.0, None, 3.0)
+    assert filled.filled(address) is filled
+
+    with pytest.raises(AttributeError):
+        address.y = 5.0
+
+
+def test_address_to_floats():
+    address = AddressVector(5.0, None, 5.0)
+    origin = AddressVector(10.0, 20.0, 30.0)
+    for relative in (False, True):
+        expected = address.to_vector(cq.Vector(10.0, 20.0, 30.0), relative)
+        assert address.to_floats(origin, relative) == expected.toTuple()
@@ -5,6 +5,7 @@ import pytest
 from OCP.Quantity import Quantity_Color, Quantity_TOC_RGB
 
 from cq_cam import Job
+from cq_cam.command import Cut, PlungeCut, PlungeRapid, Rapid, ToolChange
 
 
 @pytest.fixture(autouse=True)
@@ -63,3 +64,79 @@ def test_fluent_show__autodiscovery(job: Job, top_face, caplog, show_object):
     job.show()
 
     assert "Unsupported show_object source module (unknown)" not in caplog.text
+
+
+def test_fluent_save_gcode(job: Job, top_face, tmp_path):
+    job = job.profile(top_face).profile(top_face, outer_offset=0)
+    file_name = tmp_path / "job.nc"
+    job.save_gcode(file_name)
+    assert file_name.read_text() == job.to_gcode()
+    assert job.operations[1].to_gcode() in job.to_gcode()
+
+
+def _motion_states(gcode: str) -> list[dict[str, str]]:
+    # Machine state after each motion line, arc centers don't carry over
+    motion_words = ("G0", "G1", "G2", "G3")
+    state = {}
+    states = []
+    for line in gcode.splitlines():
+        words = line.split()
+        if not words or not (words[0] in motion_words or words[0][0] in "XYZ"):
+            continue
+        for word in words:
+            state["G" if word in motion_words else word[0]] = word
+        states.append(dict(state))
+        for letter in "IJK":
+            state.pop(letter, None)
+    return states
+
+
+def test_fluent_modal_gcode(job: Job, top_face):
+    full_gcode = job.profile(top_face).to_gcode()
+    job.modal_gcode = True
+    modal_gcode = job.profile(top_face).to_gcode()
+
+    assert len(modal_gcode) < len(full_gcode)
+    assert _motion_states(modal_gcode) == _motion_states(full_gcode)
+
+
+def test_fluent_modal_gcode__plunge(job: Job):
+    job.modal_gcode = True
+    job = job._add_operation(
+        "Plunge",
+        [
+            PlungeRapid.abs(z=1),
+            PlungeCut.abs(z=-1, feed=100),
+            PlungeCut.abs(z=-1, feed=100),
+        ],
+    )
+    assert job.operations[0].to_gcode().splitlines() == [
+        "(Job - Plunge)",
+        "G0 Z1",
+        "G1 Z-1 F100",
+        "Z-1",
+    ]
+
+
+def test_fluent_modal_gcode__tool_change(job: Job):
+    job.modal_gcode = True
+    tool_change = ToolChange(2)
+    job = job._add_operation(
+        "Tool change",
+        [
+            Rapid.abs(1, 2, 3),
+            Cut.abs(1, 2, 0, feed=100),
+            tool_change,
+            Rapid.abs(1, 2, 5),
+            Rapid.abs(1, 2, 6),
+        ],
+    )
+    assert job.operations[0].to_gcode().splitlines() == [
+        "(Job - Tool change)",
+        "G0 X1 Y2 Z3",
+        "G1 Z0 F100",
+        *str(tool_change).splitlines(),
+        # The first move after a tool change has all its axes
+        "G0 X1 Y2 Z5",
+        "Z6",
+    ]
@@ -1,3 +1,4 @@
+import math
 import unittest
 
 import cadquery as cq
@@ -8,6 +9,9 @@ from cq_cam.command import (
     CircularCW,
     CoolantState,
     Cut,
+    PlungeCut,
+    PlungeRapid,
+    Retract,
     SafetyBlock,
     StartSequence,
     StopSequence,
@@ -22,6 +26,21 @@ class TestUtils(unittest.TestCase):
         gcode = str(cmd)
         self.assertEqual("G1 X10 Y5 Z1 F200", gcode)
 
+    def test_plunge_z_only(self):
+        start = AddressVector(0, 0, 0)
+        self.assertEqual(
+            "G1 X0 Y0 Z-1 F100", str(PlungeCut.abs(-1, start=start, feed=100))
+        )
+        for cls in (PlungeRapid, Retract, PlungeCut):
+            with self.assertRaises(RuntimeError):
+                cls(AddressVector(1, None, -1), start)
+
+    def test_gcode_cached(self):
+        cmd = Cut.abs(10, 5, 1, start=AddressVector(0, 0, 0), feed=200)
+        gcode = str(cmd)
+        self.assertEqual("G1 X10 Y5 Z1 F200", gcode)
+        self.assertIs(gcode, str(cmd))
+
     def test_cw_arc(self):
         start = AddressVector(-1, 0, 0)
         mid = AddressVector(x=0, y=1, z=None)
@@ -40,6 +59,21 @@ class TestUtils(unittest.TestCase):
         gcode = str(cmd)
         self.assertEqual("G3 X1 Y0 Z0 I1 J0 K0 F200", gcode)
 
+    def test_arc_edge(self):
+        start = AddressVector(-1, 0, 0)
+        center = AddressVector(x=0, y=0, z=None)
+        cmd = CircularCW.abs(
+            1, 0, start=start, center=center, mid=AddressVector(0, 1), feed=200
+        )
+        edge = cmd.to_ais_shape(as_edges=True)
+        self.assertEqual(edge.geomType(), "CIRCLE")
+        self.assertAlmostEqual(edge.Length(), math.pi)
+
+        cmd = CircularCW.abs(
+            1, 0, start=start, center=center, mid=AddressVector(0, 1e-9), feed=200
+        )
+        self.assertEqual(cmd.to_ais_shape(as_edges=True).geomType(), "LINE")
+
     def test_stop_sequence_default(self):
         cmd = StopSequence()
         gcode = str(cmd)
@@ -1,6 +1,7 @@
 from opencamlib import ocl
 
 from cq_cam import Job
+from cq_cam.operations.op3d import Surface3D
 
 
 def test_profile_square_outside(job: Job, box):
@@ -56,3 +57,9 @@ def test_profile_square_outside(job: Job, box):
         "M5\n"
         "M30"
     )
+
+
+def test_step_depths():
+    assert Surface3D._step_depths(0, -1, 0.25) == [-0.25, -0.5, -0.75, -1]
+    assert Surface3D._step_depths(0, -0.9, 0.3) == [-0.3, -0.6, -0.9]
+    assert Surface3D._step_depths(0, -0.1, 0.5) == [-0.1]
@@ -92,6 +92,15 @@ def test_apply_stepdown_invalid_depths():
         apply_stepdown([[PathFace([], [], -5), PathFace([], [], -6)]], None, 1)
 
 
+def test_apply_stepdown_shares_paths():
+    face = PathFace([(0, 0), (1, 0), (1, 1), (0, 1)], [[(0.2, 0.2), (0.4, 0.2)]], -2)
+    sequences = apply_stepdown([[face]], None, 0.5)
+    assert [sequence[0].depth for sequence in sequences] == [-0.5, -1, -1.5]
+    for (stepped,) in sequences:
+        assert stepped.outer is face.outer
+        assert stepped.inners is face.inners
+
+
 def test_determine_stepdown_start_depth():
     upper_container = PathFace([(0, 0), (1, 0), (1, 1), (0, 1)], [], -3)
     upper_non_container = PathFace([(0, 0), (-1, 0), (-1, -1), (0, -1)], [], -3)
@@ -1,8 +1,27 @@
+import itertools
+import math
 import unittest
 
 import cadquery as cq
+import numpy as np
+import pyclipper
 
-from cq_cam.utils.utils import is_arc_clockwise2
+from cq_cam.utils.utils import (
+    WireClipper,
+    cut_clockwise,
+    edge_positions,
+    flatten_wire,
+    is_arc_clockwise,
+    is_arc_clockwise2,
+    pairwise_closed_array,
+    plane_to_world_coords,
+    position_space,
+    project_face,
+    scale_from_clipper,
+    scale_to_clipper,
+    wire_area,
+    wire_to_ordered_edges,
+)
 
 
 class TestUtils(unittest.TestCase):
@@ -43,3 +62,113 @@ class TestUtils(unittest.TestCase):
             cq.Vector(0, -1, -1),
         )
         self.assertTrue(is_arc_clockwise2(helical_cw_arc))
+
+    def test_edge_positions(self):
+        arc = cq.Edge.makeThreePointArc(
+            cq.Vector(1, 0, 0),
+            cq.Vector(0.707, 0.707, 0),
+            cq.Vector(0, 1, 0),
+        )
+        ds = position_space(arc)
+        expected = [v.toTuple() for v in arc.positions(ds)]
+        np.testing.assert_allclose(edge_positions(arc, ds), expected, atol=1e-9)
+
+    def test_wire_clipper_reset(self):
+        clipper = WireClipper()
+        clipper.add_clip_wire(
+            cq.Wire.makePolygon([(0, 0), (2, 0), (2, 2), (0, 2)], close=True)
+        )
+        clipper.add_subject_polygon([(-1, 1), (3, 1)])
+        first = clipper.execute()
+
+        clipper.reset()
+        clipper.add_subject_polygon([(-1, 1), (3, 1)])
+        self.assertEqual(first, clipper.execute())
+
+    def test_scale_to_clipper(self):
+        path = [(0.1, -0.1), (1.23456789, -9.87654321), (-1e-9, 1e3)]
+        self.assertEqual(
+            scale_to_clipper(path).tolist(), pyclipper.scale_to_clipper(path)
+        )
+        scaled = pyclipper.scale_to_clipper(path)
+        self.assertEqual(
+            scale_from_clipper(scaled).tolist(), pyclipper.scale_from_clipper(scaled)
+        )
+
+    def test_plane_to_world_coords(self):
+        plane = cq.Plane(origin=(1, 2, 3), xDir=(0, 1, 0), normal=(1, 0, 0))
+        points = [(0, 0, 0), (1, 2, 3), (-4, 5, 0.5)]
+        expected = [plane.toWorldCoords(point).toTuple() for point in points]
+        np.testing.assert_allclose(plane_to_world_coords(plane, points), expected)
+
+    def test_arc_clockwise_points(self):
+        self.assertFalse(
+            is_arc_clockwise(cq.Vector(1, 0), cq.Vector(0.707, 0.707), cq.Vector(0, 1))
+        )
+        self.assertTrue(
+            is_arc_clockwise(
+                cq.Vector(1, 0), cq.Vector(0.707, -0.707), cq.Vector(0, -1)
+            )
+        )
+
+    def test_cut_clockwise(self):
+        for flags in itertools.product([True, False], repeat=3):
+            self.assertEqual(cut_clockwise(*flags), sum(flags) % 2 == 1)
+
+    def test_pairwise_closed_array(self):
+        expected = [[[0, 0], [1, 0]], [[1, 0], [1, 1]], [[1, 1], [0, 0]]]
+        for polygon in ([(0, 0), (1, 0), (1, 1)], [(0, 0), (1, 0), (1, 1), (0, 0)]):
+            self.assertEqual(pairwise_closed_array(polygon).tolist(), expected)
+
+    def test_wire_to_ordered_edges_cache(self):
+        wire = cq.Workplane().rect(2, 2).val()
+        edges = wire_to_ordered_edges(wire)
+        self.assertEqual(wire_to_ordered_edges(wire), edges)
+
+        # Moving the wire in place must not return stale edges
+        wire.move(cq.Location(cq.Vector(1, 0, 0)))
+        moved = wire_to_ordered_edges(wire)
+        self.assertEqual(moved[0].Center().x, edges[0].Center().x + 1)
+
+    def test_flatten_wire_cache(self):
+        wire = cq.Workplane().rect(2, 2).val()
+        points = flatten_wire(wire)
+        self.assertIs(flatten_wire(wire), points)
+        self.assertFalse(points.flags.writeable)
+
+        wire.move(cq.Location(cq.Vector(1, 0, 0)))
+        np.testing.assert_allclose(flatten_wire(wire), points + (1, 0, 0))
+
+    def test_wire_area(self):
+        rect = cq.Workplane().rect(4, 2).val()
+        self.assertAlmostEqual(wire_area(rect), 8)
+        circle = cq.Workplane().circle(1).val()
+        self.assertAlmostEqual(wire_area(circle), math.pi, delta=0.01)
+
+    def test_project_face(self):
+        # Through holes project the same from both sides. The top face takes
+        # the fast path and the bottom face goes through hidden line removal.
+        part = (
+            cq.Workplane()
+            .box(10, 8, 4)
+            .faces(">Z")
+            .workplane()
+            .rect(3, 2)
+            .cutThruAll()
+            .faces(">Z")
+            .workplane()
+            .center(3, 2)
+            .circle(0.8)
+            .cutThruAll()
+        )
+        fast = project_face(part.faces(">Z").val())
+        hlr = project_face(part.faces("<Z").val())
+
+        self.assertAlmostEqual(fast.Area(), hlr.Area())
+        self.assertEqual(len(fast.innerWires()), 2)
+        self.assertEqual(len(hlr.innerWires()), 2)
+        for face in (fast, hlr):
+            bb = face.BoundingBox()
+            self.assertAlmostEqual(bb.zmin, 0)
+            self.assertAlmostEqual(bb.zmax, 0)
+            self.assertAlmostEqual(face.normalAt().z, 1)
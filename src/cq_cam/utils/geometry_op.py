@@ -1,18 +1,23 @@
 import logging
 import math
-from functools import cached_property
-from itertools import pairwise
+from functools import cache, cached_property
 from math import sqrt
 from typing import Literal, TypeAlias
 
 import cadquery as cq
+import numpy as np
 import pyclipper as pc
 import shapely
 from OCP.StdFail import StdFail_NotDone
 
 from cq_cam.utils.circle_bug_workaround import circle_bug_workaround
-from cq_cam.utils.interpolation import vectors_to_2d_tuples, wire_to_vectors
-from cq_cam.utils.utils import dist_to_segment_squared, flatten_list
+from cq_cam.utils.interpolation import wire_to_points
+from cq_cam.utils.utils import (
+    dist_to_segments_squared,
+    flatten_list,
+    scale_from_clipper,
+    scale_to_clipper,
+)
 
 logger = logging.getLogger(__name__)
 OffsetToolRadiusMultiplier: TypeAlias = float
@@ -49,7 +54,9 @@ class PathFace:
         )
 
     def clone_to_depth(self, depth: float):
-        return PathFace(list(self.outer), [list(inner) for inner in self.inners], depth)
+        # Paths are never modified in place, so every stepdown layer
+        # can share the same point lists instead of copying them
+        return PathFace(self.outer, self.inners, depth)
 
     @cached_property
     def polygon(self) -> shapely.Polygon:
@@ -99,10 +106,17 @@ def offset_wire(
     return validated_wires
 
 
-def offset_path(path: ClosedPath, offset: float, precision: int) -> list[Path]:
-    # noinspection PyArgumentList
-    scaled_path = pc.scale_to_clipper(path)
+# Use a scaled miter limit of 2. This is the default
+# noinspection PyArgumentList
+SCALED_MITER_LIMIT = pc.scale_to_clipper(2.0)
 
+
+@cache
+def scaled_offset_params(offset: float, precision: int) -> tuple[int, int]:
+    """
+    Clipper scaled offset and arc tolerance. These stay the same for
+    every contour of a pocket, so they're only scaled once.
+    """
     # noinspection PyArgumentList
     scaled_offset = pc.scale_to_clipper(offset)
 
@@ -119,14 +133,18 @@ def offset_path(path: ClosedPath, offset: float, precision: int) -> list[Path]:
     # To get a little more leeway, we divide the precision by two
     # noinspection PyArgumentList
     scaled_precision = pc.scale_to_clipper(10**-precision / 2)
+    return scaled_offset, scaled_precision
 
-    # Use a scaled miter limit of 2. This is the default
-    # noinspection PyArgumentList
-    pco = pc.PyclipperOffset(pc.scale_to_clipper(2.0), scaled_precision)
+
+def offset_path(path: ClosedPath, offset: float, precision: int) -> list[Path]:
+    scaled_path = scale_to_clipper(path)
+    scaled_offset, scaled_precision = scaled_offset_params(offset, precision)
+
+    pco = pc.PyclipperOffset(SCALED_MITER_LIMIT, scaled_precision)
     pco.AddPath(scaled_path, pc.JT_ROUND, pc.ET_CLOSEDPOLYGON)
 
     offset_paths = [
-        close_path(pc.scale_from_clipper(offsetted_path))
+        close_path(scale_from_clipper(offsetted_path).tolist())
         for offsetted_path in pc.CleanPolygons(
             pco.Execute(scaled_offset), scaled_precision
         )
@@ -136,7 +154,7 @@ def offset_path(path: ClosedPath, offset: float, precision: int) -> list[Path]:
 
 
 def wire_to_path(wire: cq.Wire, precision: int) -> Path:
-    return vectors_to_2d_tuples(wire_to_vectors(wire, precision))
+    return list(map(tuple, wire_to_points(wire, precision)[:, :2].tolist()))
 
 
 def path_to_wire(path: Path, reference: cq.Wire | float) -> cq.Wire:
@@ -145,13 +163,13 @@ def path_to_wire(path: Path, reference: cq.Wire | float) -> cq.Wire:
     else:
         z = reference
 
-    edges = [
-        cq.Edge.makeLine((a[0], a[1], z), (b[0], b[1], z)) for a, b in pairwise(path)
-    ]
-
-    # This can be fairly slow
-    wire = cq.Wire.assembleEdges(edges)
-    return wire
+    # Build the whole polyline in one go instead of assembling
+    # individually made line edges
+    points = [(x, y, z) for x, y in path]
+    closed = len(points) > 2 and path[0] == path[-1]
+    if closed:
+        points.pop()
+    return cq.Wire.makePolygon(points, close=closed)
 
 
 def offset_face(
@@ -182,9 +200,9 @@ def poly_tree_to_poly_faces(poly_tree: pc.PyPolyNode, depth: float) -> list[Path
     for face in poly_tree.Childs:
         if face.depth > 1:
             logger.warning("Deep face encountered in make_polyface")
-        outer = tuplify_path(close_path(pc.scale_from_clipper(face.Contour)))
+        outer = tuplify_path(close_path(scale_from_clipper(face.Contour).tolist()))
         inners = [
-            tuplify_path(close_path(pc.scale_from_clipper(child.Contour)))
+            tuplify_path(close_path(scale_from_clipper(child.Contour).tolist()))
             for child in face.Childs
         ]
         polyfaces.append(PathFace(outer, inners, depth))
@@ -210,16 +228,55 @@ def offset_polyface(
         return [PathFace(outer, inners=[], depth=polyface.depth) for outer in outers]
 
 
-def prepare_path_boolean_op(subjects: list[Path], clips: list[Path]) -> pc.Pyclipper:
+def scale_paths(paths: list[Path]) -> list[np.ndarray]:
+    """
+    Scale paths to clipper integers. Useful for clip paths that are
+    reused across many boolean operations.
+    """
+    return [scale_to_clipper(path) for path in paths]
+
+
+def path_bounds(paths: list[Path]) -> np.ndarray:
+    """
+    :return: array of shape (N, 4) with the (xmin, ymin, xmax, ymax) of each path
+    """
+    if not paths:
+        return np.empty((0, 4))
+    return np.array(
+        [(*np.min(path, axis=0), *np.max(path, axis=0)) for path in paths],
+        dtype=float,
+    ).reshape(-1, 4)
+
+
+def overlapping_paths(paths: list[Path], others: list[Path]) -> list[Path]:
+    """
+    Filter `paths` down to the ones whose bounding box overlaps the
+    bounding box of at least one of `others`. Paths far from every
+    subject can't affect a boolean operation on them.
+    """
+    if not paths or not others:
+        return []
+    a = path_bounds(paths)[:, None, :]
+    b = path_bounds(others)[None, :, :]
+    overlap = (
+        (a[..., 0] <= b[..., 2])
+        & (b[..., 0] <= a[..., 2])
+        & (a[..., 1] <= b[..., 3])
+        & (b[..., 1] <= a[..., 3])
+    ).any(axis=1)
+    return [path for path, keep in zip(paths, overlap) if keep]
+
+
+def prepare_path_boolean_op(
+    subjects: list[Path], clips: list[Path], clips_scaled=False
+) -> pc.Pyclipper:
     clipper = pc.Pyclipper()
-    # noinspection PyArgumentList
-    scaled_subjects = [pc.scale_to_clipper(subject) for subject in subjects]
-    # noinspection PyArgumentList
-    scaled_clips = [pc.scale_to_clipper(clip) for clip in clips]
+    scaled_subjects = scale_paths(subjects)
+    scaled_clips = clips if clips_scaled else scale_paths(clips)
 
     clipper.AddPaths(scaled_subjects, pc.PT_SUBJECT)
 
-    if scaled_clips:
+    if len(scaled_clips):
         clipper.AddPaths(scaled_clips, pc.PT_CLIP)
 
     return clipper
@@ -229,14 +286,16 @@ def boolean_op_path_list(
     subjects: list[Path], clips: list[Path], clip_type: int
 ) -> list[Path]:
     clipper = prepare_path_boolean_op(subjects, clips)
-    results = [pc.scale_from_clipper(result) for result in clipper.Execute(clip_type)]
+    results = [
+        scale_from_clipper(result).tolist() for result in clipper.Execute(clip_type)
+    ]
     return results
 
 
 def boolean_op_poly_tree(
-    subjects: list[Path], clips: list[Path], clip_type: int
+    subjects: list[Path], clips: list[Path], clip_type: int, clips_scaled=False
 ) -> pc.PyPolyNode:
-    clipper = prepare_path_boolean_op(subjects, clips)
+    clipper = prepare_path_boolean_op(subjects, clips, clips_scaled)
     results = clipper.Execute2(clip_type)
     return results
 
@@ -250,10 +309,13 @@ def union_poly_tree(
 
 
 def difference_poly_tree(
-    subjects: list[Path], clips: list[Path], depth: float
+    subjects: list[Path], clips: list[Path], depth: float, clips_scaled=False
 ) -> list[PathFace]:
+    """
+    :param clips_scaled: clips have already been scaled with `scale_paths`
+    """
     return poly_tree_to_poly_faces(
-        boolean_op_poly_tree(subjects, clips, pc.CT_DIFFERENCE), depth
+        boolean_op_poly_tree(subjects, clips, pc.CT_DIFFERENCE, clips_scaled), depth
     )
 
 
@@ -264,20 +326,21 @@ def segment_length_squared(s1: Point, s2: Point):
 def distance_to_path(
     point: Point, path: Path
 ) -> tuple[float, Point, PathSegmentPosition]:
-    distance, closest_point, poly_position = None, None, None
-    for i, (segment_start, segment_end) in enumerate(pairwise(path)):
-        s_distance, s_closest_point = dist_to_segment_squared(
-            point, segment_start, segment_end
-        )
-        if distance is None or s_distance < distance:
-            distance = s_distance
-            closest_point = s_closest_point
-            segment_length = segment_length_squared(segment_start, segment_end)
-            point_length = segment_length_squared(segment_start, closest_point)
-
-            # the lengths are squared, so to get the correct ratio
-            # sqrt needs to be applied
-            poly_param = sqrt(point_length / segment_length)
-            poly_position = (i, poly_param)
-
-    return distance, closest_point, poly_position
+    if len(path) < 2:
+        return None, None, None
+
+    points = np.asarray(path, dtype=float)
+    distances, closest_points = dist_to_segments_squared(point, points[:-1], points[1:])
+
+    i = int(np.argmin(distances))
+    segment_start = tuple(points[i].tolist())
+    closest_point = tuple(closest_points[i].tolist())
+    segment_length = segment_length_squared(
+        segment_start, tuple(points[i + 1].tolist())
+    )
+    point_length = segment_length_squared(segment_start, closest_point)
+
+    # the lengths are squared, so to get the correct ratio
+    # sqrt needs to be applied
+    poly_param = sqrt(point_length / segment_length) if segment_length else 0.0
+    return float(distances[i]), closest_point, (i, poly_param)
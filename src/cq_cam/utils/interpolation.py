@@ -1,9 +1,8 @@
 import cadquery as cq
 import numpy as np
 from OCP import Geom
-from OCP.TopAbs import TopAbs_REVERSED
 
-from cq_cam.utils.utils import edge_start_end, wire_to_ordered_edges
+from cq_cam.utils.utils import EdgeInfo, edge_positions, wire_to_edge_infos
 
 
 def get_edge_basis_curve(edge: cq.Edge):
@@ -33,60 +32,78 @@ def get_underlying_geom_type(edge: cq.Edge):
     return geom_LUT_CURVE[curve.__class__]
 
 
-def interpolate_edge_to_vectors(edge: cq.Edge, precision: int) -> list[cq.Vector]:
+def interpolate_edge_to_points(edge: cq.Edge | EdgeInfo, precision: int) -> np.ndarray:
+    info = EdgeInfo.of(edge)
     # Interpolation must have at least two edges
-    n = edge_interpolation_count(edge, precision)
+    n = edge_interpolation_count(info, precision)
 
-    orientation = edge.wrapped.Orientation()
-    if orientation == TopAbs_REVERSED:
+    if info.reversed:
         i, j = 1, 0
     else:
         i, j = 0, 1
 
-    interpolations = []
-    for length in np.linspace(i, j, n):
-        interpolations.append(edge.positionAt(length))
+    return edge_positions(info.edge, np.linspace(i, j, n), info.length)
 
-    return interpolations
+
+def interpolate_edge_to_vectors(
+    edge: cq.Edge | EdgeInfo, precision: int
+) -> list[cq.Vector]:
+    positions = interpolate_edge_to_points(edge, precision)
+    return [cq.Vector(*position) for position in positions.tolist()]
 
 
 def vectors_to_2d_tuples(vectors: list[cq.Vector]) -> list[tuple[float, float]]:
     return [(vector.x, vector.y) for vector in vectors]
 
 
-def edge_to_vectors(edge: cq.Edge, precision: int) -> list[cq.Vector]:
-    geom_type = edge.geomType()
+def edge_to_points(edge: cq.Edge | EdgeInfo, precision: int) -> np.ndarray:
+    info = EdgeInfo.of(edge)
+    geom_type = info.geom_type
     if geom_type == "OFFSET":
-        geom_type = get_underlying_geom_type(edge)
+        geom_type = get_underlying_geom_type(info.edge)
 
     if geom_type == "LINE":
-        return list(edge_start_end(edge))
+        return np.array(info.start_end_coords)
     else:
-        return interpolate_edge_to_vectors(edge, precision)
+        return interpolate_edge_to_points(info, precision)
 
 
-def wire_to_vectors(wire: cq.Wire, precision: int, close=True) -> list[cq.Vector]:
-    edges = wire_to_ordered_edges(wire)
+def edge_to_vectors(edge: cq.Edge | EdgeInfo, precision: int) -> list[cq.Vector]:
+    return [cq.Vector(*point) for point in edge_to_points(edge, precision).tolist()]
 
-    if not edges:
-        return []
 
-    vectors = edge_to_vectors(edges[0], precision)
+def wire_to_points(wire: cq.Wire, precision: int, close=True) -> np.ndarray:
+    """
+    Same as `wire_to_vectors` but returns the points as an (N, 3) array
+    """
+    edges = wire_to_edge_infos(wire)
+
+    if not edges:
+        return np.empty((0, 3))
 
-    for edge in edges[1:]:
-        vectors += edge_to_vectors(edge, precision)[1:]
+    points = np.concatenate(
+        [edge_to_points(edges[0], precision)]
+        + [edge_to_points(edge, precision)[1:] for edge in edges[1:]]
+    )
 
-    if len(vectors) == 1:
+    if len(points) == 1:
         raise ValueError("Wire resulted only in one vector")
 
-    if close and vectors[0] != vectors[-1]:
-        vectors.append(vectors[0])
+    # Compare as vectors to keep the tolerance of cq.Vector.__eq__
+    closed = cq.Vector(*points[0]) == cq.Vector(*points[-1])
+    if close and not closed:
+        points = np.concatenate((points, points[:1]))
+
+    elif not close and closed:
+        points = points[:-1]
 
-    elif not close and vectors[0] == vectors[-1]:
-        vectors = vectors[:-1]
+    return points
 
-    return vectors
+
+def wire_to_vectors(wire: cq.Wire, precision: int, close=True) -> list[cq.Vector]:
+    points = wire_to_points(wire, precision, close)
+    return [cq.Vector(*point) for point in points.tolist()]
 
 
-def edge_interpolation_count(edge: cq.Edge, precision: int):
-    return max(int(edge.Length() * 10**precision), 2)
+def edge_interpolation_count(edge: cq.Edge | EdgeInfo, precision: int):
+    return max(int(EdgeInfo.of(edge).length * 10**precision), 2)
@@ -1,13 +1,57 @@
-from dataclasses import dataclass, field
-
-from cq_cam.utils.utils import cached_dist2
+import math
+from dataclasses import InitVar, dataclass, field
 
 
 @dataclass
 class LinkedPolygon:
-    polygon: list[tuple[float, float]]
+    """
+    Closed polygon stored as a doubly linked ring of integer point ids so that
+    linking new points and walking the ring does not require index scans,
+    copies or hashing of coordinate tuples.
+    """
+
+    polygon: InitVar[list[tuple[float, float]]]
     linked_points: list[tuple[float, float]] = field(default_factory=list)
-    _linked_points: list[tuple[float, float]] = field(default_factory=list)
+    _xs: list[float] = field(init=False, default_factory=list)
+    _ys: list[float] = field(init=False, default_factory=list)
+    _next: list[int] = field(init=False, default_factory=list)
+    _prev: list[int] = field(init=False, default_factory=list)
+    _vertex_ids: dict[tuple[float, float], int] = field(
+        init=False, default_factory=dict
+    )
+    _linked_ids: dict[tuple[float, float], int] = field(
+        init=False, default_factory=dict
+    )
+    # Unused mask for `nearest_linked`, indexed by point id
+    _unused: list[bool] = field(init=False, default_factory=list)
+    _unused_count: int = field(init=False, default=0)
+
+    def __post_init__(self, polygon: list[tuple[float, float]]):
+        # A closing point is redundant in a ring
+        if len(polygon) > 1 and polygon[0] == polygon[-1]:
+            polygon = polygon[:-1]
+
+        n = len(polygon)
+        for i, point in enumerate(polygon):
+            self._add_point(point)
+            self._vertex_ids.setdefault(point, i)
+            self._next[i] = (i + 1) % n
+            self._prev[i] = (i - 1) % n
+
+    def _add_point(self, point: tuple[float, float]) -> int:
+        point_id = len(self._xs)
+        self._xs.append(point[0])
+        self._ys.append(point[1])
+        self._next.append(point_id)
+        self._prev.append(point_id)
+        self._unused.append(False)
+        return point_id
+
+    def _point(self, point_id: int) -> tuple[float, float]:
+        return self._xs[point_id], self._ys[point_id]
+
+    def _dist2(self, i: int, j: int) -> float:
+        return (self._xs[i] - self._xs[j]) ** 2 + (self._ys[i] - self._ys[j]) ** 2
 
     def link_point(
         self,
@@ -15,22 +59,27 @@ class LinkedPolygon:
         segment_start: tuple[float, float],
         segment_end: tuple[float, float],
     ):
-        assert point not in self.linked_points
-
-        i = self.polygon.index(segment_start)
-        i_1 = i + 1
-        j = self.polygon.index(segment_end)
-
-        if i_1 == j:
-            self.polygon.insert(i_1, point)
-        else:
-            point_range = self.polygon[i_1:j]
-            point_range.append(point)
-            dist2_range = [(cached_dist2(p, segment_start), p) for p in point_range]
-            dist2_range.sort(key=lambda k: k[0])
-            point_range = [p for _, p in dist2_range]
-            self.polygon.insert(i_1 + point_range.index(point), point)
-
+        assert point not in self._linked_ids
+
+        start_id = self._vertex_ids[segment_start]
+        end_id = self._vertex_ids[segment_end]
+        point_id = self._add_point(point)
+
+        # Previously linked points may already sit between the segment
+        # ends, find the spot where the new point belongs
+        d2 = self._dist2(point_id, start_id)
+        previous_id = start_id
+        next_id = self._next[start_id]
+        while next_id != end_id and self._dist2(next_id, start_id) <= d2:
+            previous_id = next_id
+            next_id = self._next[next_id]
+
+        self._next[previous_id] = point_id
+        self._prev[point_id] = previous_id
+        self._next[point_id] = next_id
+        self._prev[next_id] = point_id
+
+        self._linked_ids[point] = point_id
         self.linked_points.append(point)
 
     def reset(self, start_point: tuple[float, float] | None = None):
@@ -41,12 +90,41 @@ class LinkedPolygon:
                             from candidates
         :return:
         """
-        self._linked_points = self.linked_points[:]
+        for point_id in self._linked_ids.values():
+            self._unused[point_id] = True
+        self._unused_count = len(self._linked_ids)
         if start_point:
-            self._linked_points.remove(start_point)
+            self.drop(start_point)
 
     def drop(self, point: tuple[float, float] | None):
-        self._linked_points.remove(point)
+        point_id = self._linked_ids[point]
+        if not self._unused[point_id]:
+            raise ValueError(f"{point} is not an unused linked point")
+        self._unused[point_id] = False
+        self._unused_count -= 1
+
+    def _scan(
+        self, point_id: int, links: list[int], limit=math.inf
+    ) -> tuple[float, list[int]]:
+        """
+        Walk the ring from `point_id` following `links` until an unused
+        linked point is found
+
+        :param limit: give up once the summed distance exceeds this
+        :return: summed squared distance from the start and the visited ids
+        """
+        distance = 0
+        sequence = []
+        next_id = links[point_id]
+        while next_id != point_id:
+            distance += self._dist2(point_id, next_id)
+            if distance > limit:
+                break
+            sequence.append(next_id)
+            if self._unused[next_id]:
+                break
+            next_id = links[next_id]
+        return distance, sequence
 
     def nearest_linked(self, point: tuple[float, float]):
         """
@@ -58,36 +136,23 @@ class LinkedPolygon:
         :param point: entry point (must be linked!)
         :return: exit point or None if no more points remain
         """
-        self._linked_points.remove(point)
-        if not self._linked_points:
+        self.drop(point)
+        if not self._unused_count:
             return None
 
-        i = self.polygon.index(point)
-        search_polygon = self.polygon[i + 1 :] + self.polygon[:i]
-        # Search forward
-        forward_distance = 0
-        forward_sequence = []
-        last_point = point
-        for next_point in search_polygon:
-            forward_distance += cached_dist2(last_point, next_point)
-            forward_sequence.append(next_point)
-            if next_point in self._linked_points:
-                break
-
-        reverse_distance = 0
-        reverse_sequence = []
-        last_point = point
-        search_polygon.reverse()
-        for next_point in search_polygon:
-            # Reverse order of arguments to avoid missing cache
-            reverse_distance += cached_dist2(next_point, last_point)
-            reverse_sequence.append(next_point)
-            if next_point in self._linked_points:
-                break
-
-        if forward_distance < reverse_distance:
-            self._linked_points.remove(forward_sequence[-1])
-            return forward_sequence
-
-        self._linked_points.remove(reverse_sequence[-1])
-        return reverse_sequence
+        point_id = self._linked_ids[point]
+
+        forward_distance, forward_sequence = self._scan(point_id, self._next)
+        # The reverse walk can not win once it is longer than the forward one
+        reverse_distance, reverse_sequence = self._scan(
+            point_id, self._prev, forward_distance
+        )
+
+        sequence = (
+            forward_sequence
+            if forward_distance < reverse_distance
+            else reverse_sequence
+        )
+        self._unused[sequence[-1]] = False
+        self._unused_count -= 1
+        return [self._point(i) for i in sequence]
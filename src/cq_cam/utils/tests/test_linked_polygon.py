@@ -0,0 +1,16 @@
+from cq_cam.utils.linked_polygon import LinkedPolygon
+
+
+def test_linked_polygon():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+    linked_polygon = LinkedPolygon(square)
+    linked_polygon.link_point((6, 0), (0, 0), (10, 0))
+    linked_polygon.link_point((3, 0), (0, 0), (10, 0))
+    linked_polygon.link_point((0, 5), (0, 10), (0, 0))
+
+    linked_polygon.reset()
+    assert linked_polygon.nearest_linked((0, 5)) == [(0, 0), (3, 0)]
+    assert linked_polygon.nearest_linked((6, 0)) is None
+
+    linked_polygon.reset((0, 5))
+    assert linked_polygon.nearest_linked((3, 0)) == [(6, 0)]
@@ -1,6 +1,6 @@
 import cadquery as cq
 
-from cq_cam.utils.geometry_op import make_polyfaces, wire_to_path
+from cq_cam.utils.geometry_op import make_polyfaces, overlapping_paths, wire_to_path
 from cq_cam.utils.tests.conftest import shift_polygon
 
 
@@ -35,3 +35,12 @@ def test_make_polyface():
     assert polyfaces[0].inners[0] == shift_polygon(inners[0], 1)
     assert polyfaces[1].outer == shift_polygon(outers[1], 3)
     assert polyfaces[1].inners[0] == shift_polygon(inners[1], 1)
+
+
+def test_overlapping_paths():
+    subjects = [[(0, 0), (2, 0), (2, 2), (0, 2)], [(10, 0), (12, 0), (12, 2)]]
+    inside = [(0.5, 0.5), (1, 0.5), (1, 1)]
+    touching = [(2, 2), (3, 2), (3, 3)]
+    far = [(5, 5), (6, 5), (6, 6)]
+    assert overlapping_paths([inside, far, touching], subjects) == [inside, touching]
+    assert overlapping_paths([inside], []) == []
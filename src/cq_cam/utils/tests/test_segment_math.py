@@ -1,5 +1,11 @@
+import numpy as np
+
 from cq_cam.utils.geometry_op import distance_to_path
-from cq_cam.utils.utils import dist_to_segment_squared
+from cq_cam.utils.utils import (
+    dist2,
+    dist_to_segment_squared,
+    dist_to_segment_squared_batch,
+)
 
 
 def test_dist_to_segment_squared():
@@ -30,3 +36,20 @@ def test_distance_to_path():
     assert distance == 0.5
     assert closest_point == (0.5, 0.5)
     assert poly_position == (1, 0.5)
+
+
+def test_dist_to_segment_squared_batch():
+    points = np.array([(0, 1), (-3, 0.5), (2, -2), (0.25, 0.75)])
+    for segment_start, segment_end in [((-1, 0), (1, 1.5)), ((2, 2), (2, 2))]:
+        expected = [
+            (
+                dist_to_segment_squared(tuple(point), segment_start, segment_end)[0]
+                if segment_start != segment_end
+                else dist2(tuple(point), segment_start)
+            )
+            for point in points
+        ]
+        assert (
+            dist_to_segment_squared_batch(points, segment_start, segment_end).tolist()
+            == expected
+        )
@@ -1,7 +1,9 @@
 import itertools
 import math
-from functools import cache
-from typing import Iterable, T, Union
+import weakref
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Iterable, T, Union
 
 import numpy as np
 import pyclipper
@@ -10,12 +12,15 @@ from cadquery.occ_impl.shapes import TOLERANCE
 from OCP.BRep import BRep_Tool
 from OCP.BRepLib import BRepLib
 from OCP.BRepTools import BRepTools_WireExplorer
+from OCP.GCPnts import GCPnts_AbscissaPoint
+from OCP.GeomAbs import GeomAbs_Circle
 from OCP.gp import gp_Ax2, gp_Dir, gp_Pnt
 from OCP.HLRAlgo import HLRAlgo_Projector
 from OCP.HLRBRep import HLRBRep_Algo, HLRBRep_HLRToShape
+from OCP.ShapeAnalysis import ShapeAnalysis
 from OCP.TopAbs import TopAbs_EDGE, TopAbs_FACE, TopAbs_REVERSED, TopAbs_ShapeEnum
 from OCP.TopExp import TopExp_Explorer
-from OCP.TopoDS import TopoDS, TopoDS_Shape
+from OCP.TopoDS import TopoDS, TopoDS_Shape, TopoDS_Vertex
 
 
 def edge_end_point(edge: cq.Edge, precision=3) -> cq.Vector:
@@ -67,34 +72,183 @@ def drop_z(vector: cq.Vector) -> tuple[float, float]:
     return vector.x, vector.y
 
 
-def position_space(edge: cq.Edge, tolerance=0.1):
+@dataclass
+class EdgeInfo:
+    """
+    Edge with its commonly needed OCCT queries evaluated at most once
+    """
+
+    edge: cq.Edge
+
+    @classmethod
+    def of(cls, edge: Union[cq.Edge, "EdgeInfo"]) -> "EdgeInfo":
+        return edge if isinstance(edge, EdgeInfo) else cls(edge)
+
+    @cached_property
+    def reversed(self) -> bool:
+        return self.edge.wrapped.Orientation() == TopAbs_REVERSED
+
+    @cached_property
+    def geom_type(self) -> str:
+        return self.edge.geomType()
+
+    @cached_property
+    def length(self) -> float:
+        return self.edge.Length()
+
+    @cached_property
+    def start_end_coords(
+        self,
+    ) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
+        """
+        Same as `start_end` as plain coordinates, read straight from the
+        bounding vertices of the edge without any cq.Vertex or cq.Vector
+        """
+        first, last = TopoDS_Vertex(), TopoDS_Vertex()
+        ShapeAnalysis.FindBounds_s(self.edge.wrapped, first, last)
+        first, last = BRep_Tool.Pnt_s(first).Coord(), BRep_Tool.Pnt_s(last).Coord()
+        # https://github.com/CadQuery/cadquery/issues/831
+        if self.reversed:
+            return last, first
+        return first, last
+
+    @cached_property
+    def start_end(self) -> tuple[cq.Vector, cq.Vector]:
+        start, end = self.start_end_coords
+        return cq.Vector(*start), cq.Vector(*end)
+
+    @property
+    def start(self) -> cq.Vector:
+        return self.start_end[0]
+
+    @property
+    def end(self) -> cq.Vector:
+        return self.start_end[1]
+
+
+def wire_to_edge_infos(wire: cq.Wire) -> list[EdgeInfo]:
+    return [EdgeInfo(edge) for edge in wire_to_ordered_edges(wire)]
+
+
+def plane_basis(plane: cq.Plane) -> np.ndarray:
+    """
+    :return: 3x3 array with the plane x, y and z directions as rows
+    """
+    return np.array([plane.xDir.toTuple(), plane.yDir.toTuple(), plane.zDir.toTuple()])
+
+
+def plane_to_world_coords(plane: cq.Plane, points: Iterable) -> np.ndarray:
+    """
+    Vectorized `plane.toWorldCoords` for many points at once
+
+    :param points: local (x, y, z) coordinates
+    :return: array of shape (N, 3)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    return points @ plane_basis(plane) + plane.origin.toTuple()
+
+
+# Shared read-only `position_space` results for the common sample counts
+_linspace_cache: dict[int, np.ndarray] = {}
+_LINSPACE_CACHE_MAX_COUNT = 256
+
+
+def position_space(edge: cq.Edge, tolerance=0.1, length: float | None = None):
     # TODO orientation check
-    return np.linspace(0, 1, math.ceil(edge.Length() / tolerance))
+    length = edge.Length() if length is None else length
+    count = math.ceil(length / tolerance)
+    if count > _LINSPACE_CACHE_MAX_COUNT:
+        return np.linspace(0, 1, count)
+
+    space = _linspace_cache.get(count)
+    if space is None:
+        space = np.linspace(0, 1, count)
+        space.flags.writeable = False
+        _linspace_cache[count] = space
+    return space
+
+
+def edge_positions(
+    edge: cq.Edge, ds: Iterable[float], length: float | None = None
+) -> np.ndarray:
+    """
+    Same as `edge.positions(ds)` but reuses a single curve adaptor and
+    curve length for all the samples.
 
+    :param length: edge length if already known
+    :return: array of shape (N, 3)
+    """
+    curve = edge._geomAdaptor()
+    if length is None:
+        length = GCPnts_AbscissaPoint.Length_s(curve)
+    first = curve.FirstParameter()
+
+    if curve.GetType() == GeomAbs_Circle:
+        # Circles are parametrized by angle, so the points can be
+        # evaluated in one go without per point OCCT calls
+        circle = curve.Circle()
+        radius = circle.Radius()
+        axis = circle.Position()
+        u = first + np.asarray(ds, dtype=float) * length / radius
+        return np.asarray(axis.Location().Coord()) + radius * (
+            np.cos(u)[:, None] * np.asarray(axis.XDirection().Coord())
+            + np.sin(u)[:, None] * np.asarray(axis.YDirection().Coord())
+        )
+
+    positions = [
+        curve.Value(GCPnts_AbscissaPoint(curve, length * d, first).Parameter()).Coord()
+        for d in ds
+    ]
+    return np.array(positions, dtype=float).reshape(-1, 3)
 
-def flatten_edges(edges: list[cq.Edge]):
-    vxs = []
-    for i, edge in enumerate(edges):
-        # LINE ARC CIRCLE SPLINE
-        # if i == 0:
-        #    vxs.append(edge.startPoint())
 
-        if edge.geomType() == "LINE":
-            vxs.append(edge_end_point(edge))
-            # TODO tmp
-        elif edge.geomType() in ["ARC", "CIRCLE", "OFFSET"]:
+def flatten_edges(edges: list[cq.Edge | EdgeInfo]) -> np.ndarray:
+    # Resolve the sample parameters first so that the points
+    # can be written straight into a preallocated buffer
+    samples = []
+    count = 0
+    for edge in edges:
+        info = EdgeInfo.of(edge)
+        # LINE ARC CIRCLE SPLINE
+        if info.geom_type == "LINE":
+            ds = None
+            count += 1
+        elif info.geom_type in ["ARC", "CIRCLE", "OFFSET"]:
             # TODO handle full circles
             # TODO make sure position_space ends up returning something (really tiny arcs?)
-            positions = edge.positions(position_space(edge)[1:])
-            vxs += positions
+            ds = position_space(info.edge, length=info.length)[1:]
+            count += len(ds)
+        else:
+            raise ValueError(f"UNKNOWN TYPE {info.geom_type}")
+        samples.append((info, ds))
+
+    points = np.empty((count, 3))
+    i = 0
+    for info, ds in samples:
+        if ds is None:
+            points[i] = info.start_end_coords[1]
+            i += 1
         else:
-            print("UNKNOWN TYPE", edge.geomType())
-            raise ValueError(f"UNKNOWN TYPE {edge.geomType()}")
-    return vxs
+            points[i : i + len(ds)] = edge_positions(info.edge, ds, info.length)
+            i += len(ds)
+    return points
+
 
+_flat_wire_cache: dict[int, tuple[TopoDS_Shape, np.ndarray]] = {}
 
-def flatten_wire(wire: cq.Wire) -> list[cq.Vector]:
-    return flatten_edges(wire_to_ordered_edges(wire))
+
+def _flatten_wire(wire: cq.Wire) -> np.ndarray:
+    points = flatten_edges(wire_to_edge_infos(wire))
+    points.flags.writeable = False
+    return points
+
+
+def flatten_wire(wire: cq.Wire) -> np.ndarray:
+    """
+    Flatten a wire to points, the read-only result is cached per wire
+    like `wire_to_ordered_edges`.
+    """
+    return _wire_cached(_flat_wire_cache, wire, _flatten_wire)
 
 
 def is_arc_clockwise(start: cq.Vector, mid: cq.Vector, end: cq.Vector):
@@ -104,14 +258,9 @@ def is_arc_clockwise(start: cq.Vector, mid: cq.Vector, end: cq.Vector):
             "Helical arcs not supported yet", start.z, mid.z, end.z
         )
 
-    # start -> end
-    se = (end.x - start.x, end.y - start.y)
-
-    # start -> mid
-    sm = (mid.x - start.x, mid.y - start.y)
-
-    # cross product
-    cp = se[0] * sm[1] - se[1] * sm[0]
+    sx, sy = start.x, start.y
+    # Cross product of start -> end and start -> mid
+    cp = (end.x - sx) * (mid.y - sy) - (end.y - sy) * (mid.x - sx)
 
     # Arc is clockwise if cross product is positive
     return cp > 0
@@ -127,24 +276,53 @@ def is_arc_clockwise2(arc: cq.Edge):
     return normal.z < 0
 
 
+# Ordered edges of live wire objects keyed by id, see `wire_to_ordered_edges`
+def _wire_cached(cache: dict, wire: cq.Wire, build: Callable[[cq.Wire], T]) -> T:
+    """
+    Look up `build(wire)` from `cache`. Results live for as long as the
+    wire object is alive and its shape has not been moved or replaced.
+    """
+    key = id(wire)
+    cached = cache.get(key)
+    if cached is not None and cached[0].IsEqual(wire.wrapped):
+        return cached[1]
+
+    value = build(wire)
+    if cached is None:
+        weakref.finalize(wire, cache.pop, key, None)
+    # Keep a copy of the shape handle so that in-place moves are detected
+    cache[key] = (wire.wrapped.Located(wire.wrapped.Location()), value)
+    return value
+
+
+_ordered_edge_cache: dict[int, tuple[TopoDS_Shape, tuple[cq.Edge, ...]]] = {}
+
+
+def _explore_ordered_edges(wire: cq.Wire) -> tuple[cq.Edge, ...]:
+    explorer = BRepTools_WireExplorer(wire.wrapped)
+    ordered_edges = []
+    # More() checks the current edge without creating a new
+    # TopoDS_Edge handle like Current() does
+    while explorer.More():
+        ordered_edges.append(Edge(explorer.Current()))
+        explorer.Next()
+    return tuple(ordered_edges)
+
+
 def wire_to_ordered_edges(wire: cq.Wire) -> list[cq.Edge]:
     """
     It's a trap.
 
     OpenCASCADE topology doesn't mind wire edges not being in order.
 
+    The result is cached for as long as the wire object is alive and
+    its shape has not been moved or replaced.
+
     https://dev.opencascade.org/content/connectivity-edges-sequence
     :param wire: wire to explore edges from
     :return: list of ordered Edges
     """
-
-    explorer = BRepTools_WireExplorer(wire.wrapped)
-    ordered_edges = []
-    while not explorer.Current().IsNull():
-        ordered_edges.append(Edge(explorer.Current()))
-        explorer.Next()
-
-    return ordered_edges
+    return list(_wire_cached(_ordered_edge_cache, wire, _explore_ordered_edges))
 
 
 def cut_clockwise(positive_offset: bool, spindle_clockwise: bool, climb: bool):
@@ -163,17 +341,54 @@ def cut_clockwise(positive_offset: bool, spindle_clockwise: bool, climb: bool):
     :param climb: climb milling (vs conventional milling)
     :return: cut clockwise (or counter-clockwise)
     """
-    return bool((positive_offset + spindle_clockwise + climb) % 2)
+    return bool(positive_offset) ^ bool(spindle_clockwise) ^ bool(climb)
 
 
 def flatten_list(lst: Iterable[Iterable[T]]) -> list[T]:
     return [element for nested_lst in lst for element in nested_lst]
 
 
+def pairwise_closed_array(polygon: Iterable) -> np.ndarray:
+    """
+    Segments of a closed polygon, including the closing segment
+
+    A repeated closing point is dropped so that it does not turn
+    into a zero length segment.
+
+    :param polygon: (N, dim) points
+    :return: (N, 2, dim) array of segment start and end points
+    """
+    points = np.asarray(polygon, dtype=float)
+    if len(points) > 1 and (points[0] == points[-1]).all():
+        points = points[:-1]
+    return np.stack((points, np.roll(points, -1, axis=0)), axis=1)
+
+
+# Same scale that pyclipper.scale_to_clipper uses by default
+CLIPPER_SCALE = 2**31
+
+
+def scale_to_clipper(path: Iterable) -> np.ndarray:
+    """
+    Vectorized `pyclipper.scale_to_clipper`. Truncates towards zero
+    like pyclipper does.
+    """
+    return (np.asarray(path, dtype=float) * CLIPPER_SCALE).astype(np.int64)
+
+
+def scale_from_clipper(path: Iterable) -> np.ndarray:
+    """
+    Vectorized `pyclipper.scale_from_clipper`
+    """
+    return np.asarray(path, dtype=np.int64) / CLIPPER_SCALE
+
+
 class WireClipper:
     def __init__(self):
         self._clipper = pyclipper.Pyclipper()
-        self._pt_clip_cache = []
+        # Cached clip paths grouped by closedness so that they can be
+        # restored with a single AddPaths call per group
+        self._pt_clip_cache: dict[bool, list] = {}
 
     def add_clip_wire(self, wire: cq.Wire, cache=True):
         return self._add_wire(
@@ -185,12 +400,12 @@ class WireClipper:
         return self._add_wire(wire, pyclipper.PT_SUBJECT, False, is_closed)
 
     def _add_wire(self, wire: cq.Wire, pt, cache, is_closed):
-        polygon = [drop_z(v) for v in flatten_wire(wire)]
+        polygon = flatten_wire(wire)[:, :2]
         # Not sure if i'll shoot myself in the leg with this
         if not is_closed:
-            polygon.append(polygon[0])
-        self._add_path(pyclipper.scale_to_clipper(polygon), pt, is_closed, cache)
-        return polygon
+            polygon = np.concatenate((polygon, polygon[:1]))
+        self._add_path(scale_to_clipper(polygon), pt, is_closed, cache)
+        return list(map(tuple, polygon.tolist()))
 
     def add_clip_polygon(
         self, polygon: Iterable[tuple[float, float]], is_closed=False, cache=False
@@ -202,20 +417,40 @@ class WireClipper:
     ):
         return self._add_polygon(polygon, pyclipper.PT_SUBJECT, is_closed)
 
+    def add_subject_polygons(
+        self,
+        polygons: np.ndarray | Iterable[Iterable[tuple[float, float]]],
+        is_closed=False,
+    ):
+        """
+        Add many subject polygons with a single AddPaths call
+
+        :param polygons: (M, N, 2) array or an iterable of polygons
+        """
+        if isinstance(polygons, np.ndarray):
+            paths = scale_to_clipper(polygons)
+        else:
+            paths = [scale_to_clipper(polygon) for polygon in polygons]
+        if len(paths):
+            self._clipper.AddPaths(paths, pyclipper.PT_SUBJECT, is_closed)
+
     def _add_polygon(
         self, polygon: Iterable[tuple[float, float]], pt, is_closed=False, cache=False
     ):
-        self._add_path(pyclipper.scale_to_clipper(polygon), pt, is_closed, cache)
+        self._add_path(scale_to_clipper(polygon), pt, is_closed, cache)
 
     def _add_path(self, path, pt, closed, cache):
         if pt == pyclipper.PT_CLIP and cache:
-            self._pt_clip_cache.append((path, pt, closed))
+            self._pt_clip_cache.setdefault(closed, []).append(path)
         self._clipper.AddPath(path, pt, closed)
 
     def reset(self):
+        """
+        Clear all subject paths and uncached clip paths
+        """
         self._clipper.Clear()
-        for cached in self._pt_clip_cache:
-            self._clipper.AddPath(*cached)
+        for closed, paths in self._pt_clip_cache.items():
+            self._clipper.AddPaths(paths, pyclipper.PT_CLIP, closed)
 
     def bounds(self):
         bounds: pyclipper.PyIntRect = self._clipper.GetBounds()
@@ -253,20 +488,17 @@ class WireClipper:
         # TODO detect if there's nothing to do?
         polytree = self._clipper.Execute2(clip_type)
         # TODO option to return nested structure?
-        open_paths = pyclipper.scale_from_clipper(
-            pyclipper.OpenPathsFromPolyTree(polytree)
-        )
-        closed_paths = pyclipper.scale_from_clipper(
-            pyclipper.ClosedPathsFromPolyTree(polytree)
-        )
-        # noinspection PyTypeChecker
-        for closed_path in closed_paths:
-            closed_path.append(closed_path[0])
-
-        return tuple(
-            tuple(tuple(point) for point in path)
-            for path in (closed_paths + open_paths)
-        )
+        paths = [
+            # Repeat the first point to close the path
+            scale_from_clipper(path + path[:1])
+            for path in pyclipper.ClosedPathsFromPolyTree(polytree)
+        ]
+        paths += [
+            scale_from_clipper(path)
+            for path in pyclipper.OpenPathsFromPolyTree(polytree)
+        ]
+
+        return tuple(tuple(map(tuple, path.tolist())) for path in paths)
 
     def execute_difference(self):
         return self.execute(pyclipper.CT_DIFFERENCE)
@@ -276,29 +508,101 @@ def dist2(v: tuple[float, float], w: tuple[float, float]) -> float:
     return (v[0] - w[0]) ** 2 + (v[1] - w[1]) ** 2
 
 
-@cache
-def cached_dist2(p1: tuple[float, float], p2: tuple[float, float]):
-    return dist2(p1, p2)
-
-
 def dist_to_segment_squared(
     point: tuple[float, float],
     segment_start: tuple[float, float],
     segment_end: tuple[float, float],
 ) -> tuple[float, tuple[float, float]]:
-    p, v, w = point, segment_start, segment_end
     """https://stackoverflow.com/a/1501725"""
-    l2 = dist2(v, w)
-    t = ((p[0] - v[0]) * (w[0] - v[0]) + (p[1] - v[1]) * (w[1] - v[1])) / l2
+    (px, py), (vx, vy), (wx, wy) = point, segment_start, segment_end
+    dx, dy = wx - vx, wy - vy
+    l2 = (vx - wx) ** 2 + (vy - wy) ** 2
+    t = ((px - vx) * dx + (py - vy) * dy) / l2
     t = max(0.0, min(1.0, t))
-    closest_point = (v[0] + t * (w[0] - v[0]), v[1] + t * (w[1] - v[1]))
-    return dist2(p, closest_point), closest_point
+    cx, cy = vx + t * dx, vy + t * dy
+    return (px - cx) ** 2 + (py - cy) ** 2, (cx, cy)
+
+
+def dist_to_segments_squared(
+    point: tuple[float, float], starts: np.ndarray, ends: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized `dist_to_segment_squared` for one point against many segments.
+    Zero length segments resolve to their start point.
+
+    :param starts: (N, 2) array of segment start points
+    :param ends: (N, 2) array of segment end points
+    :return: (N,) array of squared distances and (N, 2) array of closest points
+    """
+    px, py = point
+    vx, vy = starts[:, 0], starts[:, 1]
+    dx, dy = ends[:, 0] - vx, ends[:, 1] - vy
+    # float_power keeps the rounding identical to the scalar ** 2 of dist2
+    l2 = np.float_power(dx, 2) + np.float_power(dy, 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = ((px - vx) * dx + (py - vy) * dy) / l2
+    t = np.clip(np.nan_to_num(t, nan=0.0), 0.0, 1.0)
+    cx, cy = vx + t * dx, vy + t * dy
+    distances = np.float_power(px - cx, 2) + np.float_power(py - cy, 2)
+    return distances, np.column_stack((cx, cy))
+
+
+def dist_to_segment_squared_batch(
+    points: np.ndarray,
+    segment_start: tuple[float, float],
+    segment_end: tuple[float, float],
+) -> np.ndarray:
+    """
+    Vectorized `dist_to_segment_squared` for many points against one segment
+
+    :param points: (N, 2) array of points
+    :return: (N,) array of squared distances
+    """
+    (vx, vy), (wx, wy) = segment_start, segment_end
+    dx, dy = wx - vx, wy - vy
+    l2 = dist2(segment_start, segment_end)
+    px, py = points[:, 0], points[:, 1]
+    if l2:
+        t = np.clip(((px - vx) * dx + (py - vy) * dy) / l2, 0.0, 1.0)
+    else:
+        t = np.zeros(len(points))
+    # float_power keeps the rounding identical to the scalar ** 2 of dist2
+    return np.float_power(px - (vx + t * dx), 2) + np.float_power(py - (vy + t * dy), 2)
+
+
+def polygon_area(polygon: np.ndarray) -> float:
+    """
+    Shoelace area of a closed XY polygon, the closing point is optional
+    """
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def wire_area(wire: cq.Wire) -> float:
+    """
+    Approximate area enclosed by a planar XY wire. Good enough for
+    comparing wires without building a face for each of them.
+    """
+    try:
+        return polygon_area(flatten_wire(wire))
+    except ValueError:
+        # Curve types that flatten_wire can not sample
+        return cq.Face.makeFromWires(wire).Area()
 
 
 def project_face(face: cq.Face, projection_dir=(0, 0, 1)) -> cq.Face:
     """
     Based on CQ SVG export function, thanks to adam-urbanczyk.
     """
+    if tuple(projection_dir) == (0, 0, 1) and face.geomType() == "PLANE":
+        # A face facing the projection direction projects onto itself,
+        # so there's no need to run hidden line removal for it. Faces pointing
+        # away are left to HLR, which returns them facing +Z.
+        normal = face.normalAt()
+        if normal.z > 1 - 1e-9:
+            projected = face.translate(cq.Vector(0, 0, -face.Center().z))
+            # Rebuild the face from its wires like the HLR path does
+            return cq.Face.makeFromWires(projected.outerWire(), projected.innerWires())
 
     hlr = HLRBRep_Algo()
     hlr.Add(face.wrapped)
@@ -337,9 +641,7 @@ def project_face(face: cq.Face, projection_dir=(0, 0, 1)) -> cq.Face:
     visible_wires = cq.Wire.combine(visible_shapes)
 
     # Calculate Area for each wire and use the biggest as the outer wire of the final result
-    wires_with_area = [
-        (cq.Face.makeFromWires(wire).Area(), wire) for wire in visible_wires
-    ]
+    wires_with_area = [(wire_area(wire), wire) for wire in visible_wires]
     wires_with_area.sort(key=lambda v: v[0], reverse=True)
 
     wires = [wire for (_, wire) in wires_with_area]
@@ -348,7 +650,7 @@ def project_face(face: cq.Face, projection_dir=(0, 0, 1)) -> cq.Face:
 
 
 def extract_wires(
-    shape: Union[cq.Workplane, cq.Shape, list[cq.Shape]]
+    shape: Union[cq.Workplane, cq.Shape, list[cq.Shape]],
 ) -> tuple[list[cq.Wire], list[cq.Wire]]:
     if isinstance(shape, cq.Workplane):
         return extract_wires(shape.objects)
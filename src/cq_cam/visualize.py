@@ -1,4 +1,6 @@
 import logging
+from collections import defaultdict
+from functools import cache
 
 import cadquery as cq
 from OCP.AIS import AIS_MultipleConnectedInteractive, AIS_Shape
@@ -12,11 +14,10 @@ def to_occ_color(*args):
     return _to_occ_color(*args)
 
 
-_occ_color_cache = {}
-
-
+@cache
 def cached_occ_color(color: str):
-    return _occ_color_cache.setdefault(color, to_occ_color(color))
+    """Each colour name is converted to an OCCT colour only once"""
+    return to_occ_color(color)
 
 
 def visualize_job_plane(job_plane: cq.Plane, length=1):
@@ -55,10 +56,27 @@ def visualize_job(
     inverse_transform = job_plane.rG
     command_group = AIS_MultipleConnectedInteractive()
 
+    # Edges are gathered per colour into a single compound shape, which is
+    # much cheaper to connect and render than an interactive per command
+    color_edges = defaultdict(list)
     for i, command in enumerate(commands):
-        shape = command.to_ais_shape(alt_color=i % 2)
-        if shape:
-            command_group.Connect(shape)
+        alt_color = i % 2
+        if command.arrow:
+            # Arrows can only be drawn on individual lines
+            shape = command.to_ais_shape(alt_color=alt_color)
+            if shape:
+                command_group.Connect(shape)
+            continue
+
+        edge = command.to_ais_shape(as_edges=True)
+        if edge:
+            color = command.ais_alt_color if alt_color else command.ais_color
+            color_edges[color].append(edge)
+
+    for color, edges in color_edges.items():
+        shape = AIS_Shape(cq.Compound.makeCompound(edges).wrapped)
+        shape.SetColor(cached_occ_color(color))
+        command_group.Connect(shape)
 
     command_group.SetLocalTransformation(inverse_transform.wrapped.Trsf())
 
@@ -76,13 +94,14 @@ def visualize_job_as_edges(
 
     Used for documentation and ocp_vscode.
     """
-    inverse_transform = job_plane.rG
+    # The job plane transform is rigid, so the edges can share a single
+    # location instead of each getting a transformed copy of its geometry
+    inverse_location = cq.Location(job_plane.rG.wrapped.Trsf())
     edges = []
 
     for command in commands:
         shape = command.to_ais_shape(as_edges=True)
         if shape:
-            edge = shape.transformShape(inverse_transform)
-            edges.append(edge)
+            edges.append(shape.moved(inverse_location))
 
     return edges